@@ -3,5 +3,3 @@
 
 __all__ = ["alarm_triage"]
 __version__ = "0.1.0"
-__version__ = "0.1.0"
-__version__ = "0.1.0"
@@ -2,64 +2,84 @@
 
 from __future__ import annotations
 
-import glob
+import csv
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, List
 
-import typer
+from . import jsonio
+from .triage import exported_repo_root, iter_alarm_candidates, triage_one
 
-from .triage import process_alarm
 
-app = typer.Typer(add_completion=False)
-
-
-def process_batch(pattern: str, out_dir: Path, offline: bool = False) -> Dict[str, Any]:
+def process_batch(
+    pattern: str, out_dir: Path, offline: bool = False, workers: int | None = None
+) -> Dict[str, Any]:
     out_dir.mkdir(parents=True, exist_ok=True)
-    alarm_files = sorted(glob.glob(pattern))
     results: List[Dict[str, Any]] = []
-    for alarm_file in alarm_files:
-        alarm_path = Path(alarm_file)
-        # Skip auxiliary JSON like probes_offline.json
-        try:
-            data = json.loads(alarm_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            continue
-        if "id" not in data:
-            continue
-        # Re-write temp alarm file to tmp dir? Not needed; process_alarm will reload.
-        single_dir = out_dir / alarm_path.stem
-        res = process_alarm(alarm_path, single_dir, offline=offline)
-        results.append(res)
-
-    # KPI / summary
-    kpi_rows = ["alarm_id,status"]
-    for r in results:
-        kpi_rows.append(f"{r['alarm']['id']},ok")
-    (out_dir / "kpi.csv").write_text("\n".join(kpi_rows) + "\n", encoding="utf-8")
+    # Auxiliary JSON like probes_offline.json is filtered out here so we
+    # never hand non-alarm files to a worker process. Loading finishes (and
+    # its thread pool is joined) before the process pool forks its workers.
+    candidates = list(iter_alarm_candidates(pattern))
+    # Alarms are independent: fan out across processes, then order by alarm
+    # id once everything is back (completion order is not deterministic).
+    # Fork starts every worker up front, so never size the pool past the
+    # number of alarms.
+    if candidates:
+        max_workers = min(len(candidates), workers or os.cpu_count() or 1)
+        with exported_repo_root(), ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futs = [
+                ex.submit(triage_one, alarm_path, out_dir / alarm_path.stem, offline=offline, alarm=alarm)
+                for alarm_path, alarm in candidates
+            ]
+            for fut in as_completed(futs):
+                results.append(fut.result())
+    results.sort(key=lambda r: str(r["alarm"]["id"]))
+
+    # KPI / summary (streamed row by row, no intermediate strings)
+    alarm_ids = [r["alarm"]["id"] for r in results]
+    with (out_dir / "kpi.csv").open("w", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(["alarm_id", "status"])
+        for alarm_id in alarm_ids:
+            writer.writerow([alarm_id, "ok"])
     (out_dir / "kpi.md").write_text(
         f"# Batch KPI\n\nTotal Alarms: {len(results)}\n\n", encoding="utf-8"
     )
-    (out_dir / "batch_report.json").write_text(
-        json.dumps({"count": len(results), "alarms": [r["alarm"]["id"] for r in results]}, indent=2),
-        encoding="utf-8",
-    )
-    return {"count": len(results), "alarms": [r["alarm"]["id"] for r in results]}
+    summary = {"count": len(results), "alarms": alarm_ids}
+    (out_dir / "batch_report.json").write_bytes(jsonio.dumps(summary, indent=True, ensure_ascii=False))
+    return summary
+
+
+def build_app():
+    """Build the Typer CLI (typer is imported lazily, see triage.build_app)."""
+    import typer
+
+    app = typer.Typer(add_completion=False)
+
+    @app.callback(invoke_without_command=True)
+    def cli(
+        alarms: str = typer.Option(..., "--alarms", help="Glob pattern of alarm JSON files"),
+        out: str = typer.Option(..., "--out", help="Batch output directory"),
+        offline: bool = typer.Option(False, "--offline", help="Use offline demo data"),
+        workers: int = typer.Option(0, "--workers", "-w", help="Parallel worker processes (0 = CPU count)"),
+    ):
+        """Process a batch of alarms into KPI + reports."""
+        summary = process_batch(alarms, Path(out), offline=offline, workers=workers or None)
+        typer.echo(json.dumps(summary, indent=2))
+
+    return app
 
 
-@app.callback(invoke_without_command=True)
-def cli(
-    alarms: str = typer.Option(..., "--alarms", help="Glob pattern of alarm JSON files"),
-    out: str = typer.Option(..., "--out", help="Batch output directory"),
-    offline: bool = typer.Option(False, "--offline", help="Use offline demo data"),
-):
-    """Process a batch of alarms into KPI + reports."""
-    summary = process_batch(alarms, Path(out), offline=offline)
-    typer.echo(json.dumps(summary, indent=2))
+def __getattr__(name: str):
+    if name == "app":  # old module-level attribute, now built on demand
+        return build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():  # pragma: no cover
-    app()
+    build_app()()
 
 
 if __name__ == "__main__":  # pragma: no cover
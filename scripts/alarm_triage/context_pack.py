@@ -2,9 +2,87 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import stat
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+from . import jsonio
+
+
+@functools.lru_cache(maxsize=4)
+def _incident_index(
+    path: str, mtime_ns: int
+) -> Tuple[List[Any], Dict[Any, List[int]], Dict[Any, List[int]]]:
+    """Parse incidents.json once and index positions by device and site.
+
+    ``mtime_ns`` is part of the cache key so an edited file is re-read.
+    """
+    try:
+        all_incidents = jsonio.loads(Path(path).read_bytes())
+    except json.JSONDecodeError:
+        return [], {}, {}
+    by_device: Dict[Any, List[int]] = defaultdict(list)
+    by_site: Dict[Any, List[int]] = defaultdict(list)
+    for idx, inc in enumerate(all_incidents):
+        device, site = _match_key(inc.get("device")), _match_key(inc.get("site"))
+        if device:
+            by_device[device].append(idx)
+        if site:
+            by_site[site].append(idx)
+    return all_incidents, dict(by_device), dict(by_site)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_source(path: str, mtime_ns: int) -> bytes:
+    return Path(path).read_bytes()
+
+
+def _source_bytes(src: Path) -> bytes | None:
+    """Bytes of a shared demo source file, read once per (path, mtime_ns)."""
+    try:
+        st = src.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return _read_source(str(src), st.st_mtime_ns)
+
+
+def _match_key(value: Any) -> Any:
+    """``value`` if it can match an incident field, else None (no match).
+
+    Only str/int ids are matched; lists/dicts from a malformed alarm would be
+    unhashable as cache and index keys.
+    """
+    return value if isinstance(value, (str, int)) else None
+
+
+@functools.lru_cache(maxsize=256)
+def _prior_incidents_doc(path: str, mtime_ns: int, device: Any, site: Any) -> Tuple[int, bytes]:
+    """Count and serialized prior_incidents.json for one (device, site).
+
+    Alarms in a batch that share a device/site reuse the same bytes.
+    """
+    all_incidents, by_device, by_site = _incident_index(path, mtime_ns)
+    hits = set(by_device.get(device, ())) if device else set()
+    if site:
+        hits.update(by_site.get(site, ()))
+    matches = [all_incidents[idx] for idx in sorted(hits)]
+    return len(matches), jsonio.dumps(matches, indent=True)
+
+
+def _prior_incidents(incidents_file: Path, device: Any, site: Any) -> Tuple[int, bytes]:
+    """Incidents matching the alarm device or site, in file order."""
+    try:
+        st = incidents_file.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return 0, jsonio.dumps([], indent=True)
+    return _prior_incidents_doc(str(incidents_file), st.st_mtime_ns, _match_key(device), _match_key(site))
 
 
 def build_context(alarm: Dict[str, Any], repo_root: Path, ctx_dir: Path) -> Dict[str, Any]:
@@ -12,35 +90,23 @@ def build_context(alarm: Dict[str, Any], repo_root: Path, ctx_dir: Path) -> Dict
     demo_dir = repo_root / "demo"
 
     # Prior incidents
-    incidents_file = demo_dir / "incidents.json"
-    incidents = []
-    if incidents_file.is_file():
-        try:
-            all_incidents = json.loads(incidents_file.read_text(encoding="utf-8"))
-            device = alarm.get("device")
-            site = alarm.get("site")
-            for inc in all_incidents:
-                if device and inc.get("device") == device:
-                    incidents.append(inc)
-                elif site and inc.get("site") == site:
-                    incidents.append(inc)
-        except json.JSONDecodeError:
-            pass
-    (ctx_dir / "prior_incidents.json").write_text(
-        json.dumps(incidents, indent=2), encoding="utf-8"
+    incidents_count, incidents_json = _prior_incidents(
+        demo_dir / "incidents.json", alarm.get("device"), alarm.get("site")
     )
+    jsonio.write_file(ctx_dir / "prior_incidents.json", incidents_json)
 
     # Config (static demo config)
-    config_src = demo_dir / "configs" / "rtr-site001-core.txt"
-    config_text = config_src.read_text(encoding="utf-8") if config_src.is_file() else "demo config missing"
-    (ctx_dir / "config.txt").write_text(config_text, encoding="utf-8")
+    config_bytes = _source_bytes(demo_dir / "configs" / "rtr-site001-core.txt")
+    if config_bytes is None:
+        config_bytes = b"demo config missing"
+    jsonio.write_file(ctx_dir / "config.txt", config_bytes)
 
     # Site diagram / notes
-    site_file = demo_dir / "diagrams" / "site001.txt"
-    if site_file.is_file():
-        (ctx_dir / "site001.txt").write_text(site_file.read_text(encoding="utf-8"), encoding="utf-8")
+    site_bytes = _source_bytes(demo_dir / "diagrams" / "site001.txt")
+    if site_bytes is not None:
+        jsonio.write_file(ctx_dir / "site001.txt", site_bytes)
 
     return {
-        "incidents_count": len(incidents),
-        "has_config": bool(config_text),
+        "incidents_count": incidents_count,
+        "has_config": bool(config_bytes),
     }
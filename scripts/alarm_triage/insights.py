@@ -9,34 +9,34 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Dict, Any
 
+from . import jsonio
+
+
+# Canned text shared by every alarm (built once at import)
+_BLAST_RADIUS_TAIL = "No adjacent core links show correlated errors in offline dataset."
+_NEXT_STEPS = (
+    "1. Collect interface counters (show interface).\n"
+    "2. Review recent changes (git diff / change log).\n"
+    "3. If persists, schedule maintenance window to replace optics."
+)
+_MD_TEMPLATE = (
+    "# ServiceNow Draft\n\n"
+    "**Summary**: {summary}\n\n"
+    "## Blast Radius\n{blast_radius}\n\n"
+    "## Suggested Next Steps\n{next_steps}\n"
+)
+
 
 def build_insights(alarm: Dict[str, Any]) -> Dict[str, str]:
     alarm_id = alarm.get("id") or alarm.get("alarm_id") or "UNKNOWN"
     device = alarm.get("device", "device")
     site = alarm.get("site", "site001")
-
-    blast_radius = (
-        f"Alarm {alarm_id} appears confined to {device} at {site}. "
-        "No adjacent core links show correlated errors in offline dataset."
-    )
-    next_steps = (
-        "1. Collect interface counters (show interface).\n"
-        "2. Review recent changes (git diff / change log).\n"
-        "3. If persists, schedule maintenance window to replace optics."
-    )
-    summary = f"Offline triage completed for {alarm_id} on {device}."
     return {
-        "summary": summary,
-        "blast_radius": blast_radius,
-        "next_steps": next_steps,
+        "summary": f"Offline triage completed for {alarm_id} on {device}.",
+        "blast_radius": f"Alarm {alarm_id} appears confined to {device} at {site}. {_BLAST_RADIUS_TAIL}",
+        "next_steps": _NEXT_STEPS,
     }
 
 
 def write_insights_md(insights: Dict[str, str], out_md: Path) -> None:
-    out_md.write_text(
-        "# ServiceNow Draft\n\n"
-        f"**Summary**: {insights['summary']}\n\n"
-        "## Blast Radius\n" + insights["blast_radius"] + "\n\n"
-        "## Suggested Next Steps\n" + insights["next_steps"] + "\n",
-        encoding="utf-8",
-    )
+    jsonio.write_file(out_md, _MD_TEMPLATE.format_map(insights).encode("utf-8"))
@@ -0,0 +1,89 @@
+"""JSON helpers for triage artifacts: orjson when installed, stdlib otherwise.
+
+``dumps`` output is byte-identical to the ``json.dumps`` call it replaced
+(2-space indent or compact separators, ``ensure_ascii`` as the caller asks),
+whichever backend is available. orjson always writes raw UTF-8 and turns
+NaN/Infinity into ``null``, so its bytes are only used when neither applies;
+otherwise the stdlib produces the output. ``write_file`` writes the resulting
+bytes (or any other artifact bytes) straight to a file descriptor.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from typing import Any, Callable
+
+try:  # optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str (raises json.JSONDecodeError on bad input)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    """True if a NaN/Infinity float appears anywhere in ``obj``."""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, float):
+            if not math.isfinite(o):
+                return True
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return False
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: bool = False,
+    default: Callable[[Any], Any] | None = None,
+    ensure_ascii: bool = True,
+) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, exactly as ``json.dumps`` would.
+
+    2-space indent if requested, otherwise compact (no spaces after ``,``/``:``).
+    ``default`` and ``ensure_ascii`` behave as in ``json``.
+    """
+    if orjson is not None:
+        try:
+            out = orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            out = None  # non-str keys, >64-bit ints, ...: let stdlib handle them
+        if (
+            out is not None
+            and (not ensure_ascii or out.isascii())
+            # a "null" may be orjson's rendering of NaN/Infinity
+            and not (b"null" in out and _has_nonfinite(obj))
+        ):
+            return out
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=ensure_ascii, default=default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=ensure_ascii, default=default).encode("utf-8")
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def write_file(path: str | os.PathLike[str], data: bytes) -> None:
+    """Replace ``path`` with ``data`` using raw ``os.write`` (no buffered file object)."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+__all__ = ["loads", "dumps", "write_file"]
@@ -27,15 +27,22 @@ Convenience:
     log.debug("debug message")
 """
 
-from datetime import datetime, timezone
+import functools
 import json
 import logging
 import sys
+import time
 from threading import RLock
-from typing import Any, Mapping, MutableMapping
+from typing import Any, Mapping
+
+from . import jsonio
 
 _DEFAULT_LOGGER_NAME = "alarm_triage"  # corrected typo
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp; a
+# burst of records within one second reuses the strftime result.
+_ts_cache: tuple[int, str] = (-1, "")
+
 # Track configured handlers by logger name so we can update safely.
 _configured_by_name: dict[str, logging.Handler] = {}
 _lock = RLock()
@@ -54,6 +61,19 @@ RESERVED = {
 }
 
 
+def _utc_ts_ms(t: float) -> str:
+    """ISO-8601 UTC timestamp with millisecond precision and Z suffix."""
+    global _ts_cache
+    sec = int(t)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    # round via microseconds like datetime does (0.123 is stored as 0.12299...)
+    ms = min(round((t - sec) * 1_000_000) // 1000, 999)
+    return f"{prefix}.{ms:03d}Z"
+
+
 def _coerce_level(level: int | str) -> int:
     if isinstance(level, int):
         return level
@@ -64,59 +84,68 @@ def _coerce_level(level: int | str) -> int:
     return logging.INFO
 
 
+# One log line; the optional event/static/fields members are spliced into the
+# final %s so only msg and user data need serializing per record.
+_LINE_TEMPLATE = (
+    '{"ts":"%s","level":%s,"logger":%s,"pid":%s,"tid":%s,'
+    '"module":%s,"func":%s,"line":%s,"msg":%s%s}'
+)
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _quoted(value: Any) -> str:
+    """JSON literal for a small, repeating value (level, logger, module, pid...)."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _to_json(value: Any) -> str:
+    return jsonio.dumps(value, default=str, ensure_ascii=False).decode("utf-8")
+
+
 class JsonFormatter(logging.Formatter):
     """JSON log formatter safe against serialization errors."""
 
     def __init__(self, *, static: dict[str, Any] | None = None) -> None:  # noqa: D401
         super().__init__()
         self._static = static or {}
+        # static metadata never changes per record: serialize it once
+        self._static_json = f',"static":{_to_json(self._static)}' if self._static else ""
 
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
-        ts = (
-            datetime.now(timezone.utc)
-            .isoformat(timespec="milliseconds")
-            .replace("+00:00", "Z")
-        )
-        msg = record.getMessage()
-        event = getattr(record, "event", None)
-        if event == msg:
-            event = None  # avoid duplication
-
-        base: dict[str, Any] = {
-            "ts": ts,
-            "level": record.levelname.lower(),
-            "logger": record.name,
-            "pid": record.process,
-            "tid": record.thread,
-            "module": record.module,
-            "func": record.funcName,
-            "line": record.lineno,
-            "msg": msg,
-        }
-        if event:
-            base["event"] = event
-        if self._static:
-            base["static"] = self._static
-
-        # Gather user fields (always nested under 'fields')
-        fields_obj = getattr(record, "fields", {})
-        user_fields: MutableMapping[str, Any]
-        if isinstance(fields_obj, Mapping):
-            user_fields = dict(fields_obj)  # shallow copy
-        else:
-            user_fields = {"_fields_type": str(type(fields_obj))}
-
-        # Ensure reserved collisions do not overwrite base
-        # (keep them inside fields as provided; base already set)
-        if user_fields:
-            base["fields"] = user_fields
-
+        ts = _utc_ts_ms(record.created)
         try:
-            return json.dumps(
-                base,
-                ensure_ascii=False,
-                separators=(",", ":"),
-                default=str,
+            msg = record.getMessage()
+            # `extra=` keys live in the instance dict; skip getattr's class lookup
+            attrs = record.__dict__
+            event = attrs.get("event")
+            if event == msg:
+                event = None  # avoid duplication
+
+            tail = f',"event":{_to_json(event)}' if event else ""
+            tail += self._static_json
+
+            # Gather user fields (always nested under 'fields'); reserved
+            # names stay inside fields as provided and never touch the base.
+            fields_obj = attrs.get("fields", {})
+            if type(fields_obj) is not dict:
+                if isinstance(fields_obj, Mapping):
+                    fields_obj = dict(fields_obj)
+                else:
+                    fields_obj = {"_fields_type": str(type(fields_obj))}
+            if fields_obj:
+                tail += f',"fields":{_to_json(fields_obj)}'
+
+            return _LINE_TEMPLATE % (
+                ts,
+                _quoted(record.levelname.lower()),
+                _quoted(record.name),
+                _quoted(record.process),
+                _quoted(record.thread),
+                _quoted(record.module),
+                _quoted(record.funcName),
+                record.lineno,
+                _to_json(msg),
+                tail,
             )
         except Exception as exc:  # pragma: no cover (very unlikely)
             fallback = {
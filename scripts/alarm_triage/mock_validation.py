@@ -5,13 +5,14 @@ from __future__ import annotations
 Seeded by alarm ID so screenshots / tests are stable across runs and platforms.
 """
 
-import hashlib
 import random
+import zlib
 from typing import Dict, Any
 
 
 def synth_metrics(alarm_id: str) -> Dict[str, Any]:
-    seed = int(hashlib.sha256(alarm_id.encode()).hexdigest()[:8], 16)
+    # crc32 is plenty for a demo seed and, unlike hash(), stable across runs
+    seed = zlib.crc32(alarm_id.encode())
     rng = random.Random(seed)
     ok = rng.random() < 0.8  # 80% pass
     ping_loss = 0.0 if ok else rng.choice([0.25, 1.0])
@@ -7,13 +7,53 @@ if explicitly requested (not used in CI). This keeps the solution read-only.
 
 from __future__ import annotations
 
+import functools
 import json
-import platform
+import locale
+import socket
+import stat
 import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+from . import jsonio
 
 DEFAULT_TIMEOUT = 3  # seconds per probe
+DNS_TTL = 900.0  # seconds a resolved probe target is reused
+MAX_OUTPUT = 5000  # bytes of probe output kept
+# what text=True would decode with; resolved once instead of per probe
+_OUTPUT_ENCODING = locale.getpreferredencoding(False)
+
+# host -> (address, monotonic expiry); shared by concurrent probes
+_dns_cache: Dict[str, Tuple[str, float]] = {}
+_dns_lock = threading.Lock()
+_DNS_CACHE_MAX = 1024
+
+
+def _resolve(host: str) -> str:
+    """Resolve ``host`` at most once per DNS_TTL so probe children get a literal IP.
+
+    Failures are not cached and return ``host`` unchanged, leaving ping /
+    traceroute to report the error as before.
+    """
+    now = time.monotonic()
+    with _dns_lock:
+        hit = _dns_cache.get(host)
+    if hit and hit[1] > now:
+        return hit[0]
+    try:
+        addr = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)[0][4][0]
+    except (OSError, IndexError):
+        return host
+    with _dns_lock:
+        if len(_dns_cache) >= _DNS_CACHE_MAX:
+            _dns_cache.clear()
+        _dns_cache[host] = (addr, now + DNS_TTL)
+    return addr
 
 
 def _run_command(cmd: List[str], timeout: int = DEFAULT_TIMEOUT) -> str:
@@ -24,34 +64,64 @@ def _run_command(cmd: List[str], timeout: int = DEFAULT_TIMEOUT) -> str:
             stderr=subprocess.STDOUT,
             timeout=timeout,
             check=False,
-            text=True,
         )
-        return out.stdout[:5000]
+        # Truncate the raw bytes first so only what is kept gets decoded.
+        return out.stdout[:MAX_OUTPUT].decode(_OUTPUT_ENCODING, errors="replace")
     except Exception as exc:  # pragma: no cover - defensive
         return f"error: {exc}"
 
 
+IS_WINDOWS = sys.platform == "win32"
+
+# Probe command builders, bound once for the platform we're running on.
+if IS_WINDOWS:  # pragma: no cover - platform specific
+
+    def _ping_cmd(target: str) -> List[str]:
+        return ["ping", "-n", "2", target]
+
+    def _trace_cmd(target: str) -> List[str]:
+        return ["tracert", "-d", target]
+
+else:
+
+    def _ping_cmd(target: str) -> List[str]:
+        return ["ping", "-c", "2", "-W", "1", target]
+
+    def _trace_cmd(target: str) -> List[str]:
+        return ["traceroute", "-n", "-m", "5", target]
+
+
 def _online_probes(target: str) -> Dict[str, Any]:  # pragma: no cover - not in CI
-    system = platform.system().lower()
-    if system == "windows":
-        ping_cmd = ["ping", "-n", "2", target]
-        trace_cmd = ["tracert", "-d", target]
-    else:
-        ping_cmd = ["ping", "-c", "2", "-W", "1", target]
-        trace_cmd = ["traceroute", "-n", "-m", "5", target]
-    return {
-        "ping": _run_command(ping_cmd),
-        "traceroute": _run_command(trace_cmd),
-    }
+    target = _resolve(target)
+    # Independent blocking subprocesses: run them side by side so a probe
+    # costs max(ping, traceroute) rather than their sum.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        ping = ex.submit(_run_command, _ping_cmd(target))
+        trace = ex.submit(_run_command, _trace_cmd(target))
+        return {
+            "ping": ping.result(),
+            "traceroute": trace.result(),
+        }
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_offline_probes(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse probes_offline.json once per (path, mtime_ns)."""
+    try:
+        return jsonio.loads(Path(path).read_bytes())
+    except json.JSONDecodeError:
+        return {"error": "invalid probes_offline.json"}
 
 
 def load_offline_probes(probes_file: Path) -> Dict[str, Any]:
-    if probes_file.is_file():
-        try:
-            return json.loads(probes_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {"error": "invalid probes_offline.json"}
-    return {"error": "missing probes_offline.json"}
+    """Offline probe results (shared parse; nested values are read-only)."""
+    try:
+        st = probes_file.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return {"error": "missing probes_offline.json"}
+    return dict(_parse_offline_probes(str(probes_file), st.st_mtime_ns))
 
 
 def gather_probes(target: str, repo_root: Path, offline: bool) -> Dict[str, Any]:
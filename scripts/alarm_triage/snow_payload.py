@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, Any
 
+from . import jsonio
+
 
 def build_snow_payload(alarm: Dict[str, Any], insights: Dict[str, str]) -> Dict[str, Any]:
     return {
@@ -19,4 +20,4 @@ def build_snow_payload(alarm: Dict[str, Any], insights: Dict[str, str]) -> Dict[
 
 
 def write_payload(payload: Dict[str, Any], out_json: Path) -> None:
-    out_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    jsonio.write_file(out_json, jsonio.dumps(payload, indent=True))
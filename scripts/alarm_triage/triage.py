@@ -9,15 +9,21 @@ Artifacts (owned here, NOT by UI):
 
 from __future__ import annotations
 
+import contextlib
 import json
 import glob
+import os
+import re
+import shutil
+import time
+import uuid
 import zipfile
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List
-
-import typer
+from typing import Dict, Any, Iterator, List
 
+from . import jsonio
 from .context_pack import build_context
 from .insights import build_insights, write_insights_md
 from .snow_payload import build_snow_payload, write_payload
@@ -25,92 +31,345 @@ from .probes import gather_probes
 from .servicenow import make_draft
 from .mock_validation import synth_metrics
 
-app = typer.Typer(add_completion=False, help="Offline-friendly alarm triage")
 
-REPO_ROOT = Path(__file__).resolve().parents[2]
+def _find_repo_root() -> Path:
+    """Repo root (demo data lives under it); ``NETAUTO_REPO_ROOT`` overrides.
+
+    An inherited value is only trusted if ``<root>/demo`` exists; otherwise the
+    root is found from ``__file__``. Nothing is written to the environment
+    here -- see ``exported_repo_root`` for worker processes.
+    """
+    env = os.environ.get("NETAUTO_REPO_ROOT")
+    if env and os.path.isdir(os.path.join(env, "demo")):
+        return Path(env)
+    return Path(__file__).resolve().parents[2]
+
+
+REPO_ROOT = _find_repo_root()
+
+
+@contextlib.contextmanager
+def exported_repo_root() -> Iterator[None]:
+    """Export ``REPO_ROOT`` as ``NETAUTO_REPO_ROOT`` while worker processes start.
+
+    Spawned workers then skip root discovery on import; the previous value
+    is restored on exit.
+    """
+    prev = os.environ.get("NETAUTO_REPO_ROOT")
+    os.environ["NETAUTO_REPO_ROOT"] = str(REPO_ROOT)
+    try:
+        yield
+    finally:
+        if prev is None:
+            os.environ.pop("NETAUTO_REPO_ROOT", None)
+        else:
+            os.environ["NETAUTO_REPO_ROOT"] = prev
+
+# Max alarms triaged concurrently by triage_batch
+BATCH_WORKERS = 16
+# Threads reading/parsing candidate alarm files before triage
+LOAD_WORKERS = 8
+
+# A file with no "id" key anywhere cannot be an alarm; checking the raw bytes
+# lets batch runs skip auxiliary JSON (probes_offline.json, ...) unparsed.
+_ID_KEY_RE = re.compile(rb'"id"\s*:')
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last audit timestamp; events
+# within the same second reuse the strftime result.
+_ts_cache: tuple[int, str] = (-1, "")
 
 
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    """Current UTC time as ISO-8601 with microseconds and a Z suffix."""
+    global _ts_cache
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{ns // 1000 % 1_000_000:06d}Z"
+
+
+def iter_alarm_files(pattern: str) -> Iterator[Path]:
+    """Yield files matching ``pattern`` lazily (unsorted).
+
+    The common ``<dir>/*.json`` case is served straight from ``os.scandir``
+    (no per-entry stat); any other pattern falls back to ``glob.iglob``.
+    """
+    directory, name = os.path.split(pattern)
+    if name == "*.json" and not any(c in directory for c in "*?["):
+        try:
+            with os.scandir(directory or ".") as it:
+                for entry in it:
+                    # glob's "*" never matches dotfiles; keep that behaviour
+                    if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file():
+                        yield Path(entry.path)
+        except FileNotFoundError:
+            return
+        return
+    for match in glob.iglob(pattern):
+        yield Path(match)
+
+
+def load_alarm_candidate(path: Path) -> Dict[str, Any] | None:
+    """Return the parsed alarm, or None for auxiliary / invalid JSON files."""
+    raw = path.read_bytes()
+    if not _ID_KEY_RE.search(raw):
+        return None
+    try:
+        data = jsonio.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or "id" not in data:
+        return None
+    return data
+
+
+def iter_alarm_candidates(pattern: str, workers: int = LOAD_WORKERS) -> Iterator[tuple[Path, Dict[str, Any]]]:
+    """Yield ``(path, alarm)`` for the real alarms matching ``pattern``.
+
+    Files are read and parsed on a small thread pool so page-cache misses
+    overlap; results come back in enumeration order. At most ``2 * workers``
+    loads are in flight, so the directory is still enumerated lazily.
+
+    The loader threads live until the generator is exhausted or closed:
+    drain it before starting a fork-based process pool.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        window: deque[tuple[Path, Future]] = deque()
+        for path in iter_alarm_files(pattern):
+            window.append((path, ex.submit(load_alarm_candidate, path)))
+            if len(window) < 2 * workers:
+                continue
+            path, fut = window.popleft()
+            alarm = fut.result()
+            if alarm is not None:
+                yield path, alarm
+        while window:
+            path, fut = window.popleft()
+            alarm = fut.result()
+            if alarm is not None:
+                yield path, alarm
 
 
 def _load_alarm(alarm_file: Path) -> Dict[str, Any]:
-    return json.loads(alarm_file.read_text(encoding="utf-8"))
+    return jsonio.loads(alarm_file.read_bytes())
+
+
+class _AuditLog:
+    """audit.jsonl records for one run, buffered and appended in one write."""
 
+    def __init__(self, path: Path, run_id: str | None = None) -> None:
+        self.path = path
+        self._run = {"run_id": run_id} if run_id else {}
+        self._pending: List[bytes] = []
 
-def _write_audit_line(audit_file: Path, event: str, **extra: Any) -> None:
-    record = {"ts": _utc_now_iso(), "event": event}
-    record.update(extra)
-    with audit_file.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(record) + "\n")
+    def event(self, event: str, **extra: Any) -> None:
+        record = {"ts": _utc_now_iso(), "event": event}
+        record.update(extra)
+        record.update(self._run)
+        self._pending.append(jsonio.dumps(record) + b"\n")
 
+    def flush(self) -> None:
+        if self._pending:
+            with self.path.open("ab") as fh:
+                fh.write(b"".join(self._pending))
+            self._pending.clear()
 
-def _zip_pack(out_dir: Path) -> Path:
-    pack_path = out_dir / f"{out_dir.name}_pack.zip"
-    with zipfile.ZipFile(pack_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        for path in out_dir.rglob("*"):
-            if path.is_file() and path != pack_path:
-                zf.write(path, path.relative_to(out_dir))
+
+def _walk_files(root: Path) -> List[str]:
+    """Regular files under ``root`` as ``root``-relative path strings.
+
+    One scandir per directory and no pathlib objects, so the zip loop and the
+    returned manifest can work on plain strings.
+    """
+    root_s = str(root)
+    files: List[str] = []
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(root_s, rel_dir)) as it:
+            for entry in it:
+                rel = os.path.join(rel_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(rel)
+                elif entry.is_file():
+                    files.append(rel)
+    return files
+
+
+# Packs are stored uncompressed by default: the members are small JSON/text
+# artifacts and deflating them costs more CPU than the bytes it saves. With
+# ``compress=True`` only larger, not-yet-compressed members are deflated.
+_STORE_BELOW = 4096
+_STORE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".zip", ".gz"})
+
+
+def _zip_level_from_env(default: int = 1) -> int:
+    """TRIAGE_ZIP_LEVEL clamped to zlib's 0-9; a bad value must not break import."""
+    try:
+        level = int(os.environ.get("TRIAGE_ZIP_LEVEL", default))
+    except ValueError:
+        return default
+    return min(max(level, 0), 9)
+
+
+# deflate level used with compress=True (1 = fastest)
+ZIP_LEVEL = _zip_level_from_env()
+
+
+def _zip_pack(out_dir: Path, members: List[str], name: str | None = None, compress: bool = False) -> Path:
+    """Zip ``members`` (paths relative to ``out_dir``) into ``<name>_pack.zip``."""
+    pack_name = f"{name or out_dir.name}_pack.zip"
+    pack_path = out_dir / pack_name
+    root_s = str(out_dir)
+    if compress:
+        zf = zipfile.ZipFile(pack_path, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_LEVEL)
+    else:
+        zf = zipfile.ZipFile(pack_path, "w", zipfile.ZIP_STORED)
+    with zf:
+        for rel in members:
+            if rel == pack_name:
+                continue
+            full = os.path.join(root_s, rel)
+            store = (
+                not compress
+                or os.path.splitext(rel)[1].lower() in _STORE_SUFFIXES
+                or os.path.getsize(full) < _STORE_BELOW
+            )
+            zf.write(full, rel, compress_type=zipfile.ZIP_STORED if store else None)
     return pack_path
 
 
+# Top-level entries triage_one writes into an alarm folder (plus the pack zip)
+_ARTIFACT_NAMES = frozenset(
+    {"audit.jsonl", "context", "snow_draft.json", "snow_draft.md", "validation.json", "draft.md"}
+)
+
+
+def _publish_dir(work: Path, out_dir: Path, pack_name: str) -> None:
+    """Move the finished ``work`` dir into place as ``out_dir``.
+
+    A new ``out_dir`` is published with one rename. An existing one may hold
+    files triage does not own (user files, the UI's duration_s.txt, or the
+    caller's cwd for ``--out .``), so it is never swapped out wholesale: each
+    artifact is replaced in place and only triage's own stale artifacts
+    (e.g. draft.md after ``--no-emit-draft``) are removed. That publish is
+    atomic per artifact, not as a whole: a reader racing a rerun sees every
+    file (or context/ dir) either complete-old or complete-new, but may see
+    old and new artifacts side by side until the loop finishes.
+    """
+    if not os.path.lexists(out_dir):
+        try:
+            os.rename(work, out_dir)
+            return
+        except OSError:
+            pass  # created concurrently: fall through to the in-place path
+    work_s, out_s = str(work), str(out_dir)
+    produced = os.listdir(work_s)
+    for name in (_ARTIFACT_NAMES | {pack_name}).difference(produced):
+        stale = os.path.join(out_s, name)
+        if os.path.isdir(stale) and not os.path.islink(stale):
+            shutil.rmtree(stale, ignore_errors=True)
+        elif os.path.lexists(stale):
+            os.remove(stale)
+    for name in produced:
+        src, dst = os.path.join(work_s, name), os.path.join(out_s, name)
+        if os.path.isdir(dst) and not os.path.islink(dst):
+            old = f"{work_s}.{name}.old"
+            os.rename(dst, old)
+            os.rename(src, dst)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(src, dst)
+    os.rmdir(work_s)
+
+
 def triage_one(
     alarm_path: Path,
     out_dir: Path,
     offline: bool = False,
     emit_draft: bool = True,
     run_id: str | None = None,
+    alarm: Dict[str, Any] | None = None,
+    pack_compress: bool = False,
 ) -> Dict[str, Any]:
     """Process a single alarm deterministically.
 
     Ownership: all artifacts produced here (UI must be read-only).
+    ``alarm`` may carry the already-parsed contents of ``alarm_path`` (batch
+    mode parses each file once while filtering).
     """
-    out_dir.mkdir(parents=True, exist_ok=True)
-    audit_file = out_dir / "audit.jsonl"
-    _write_audit_line(audit_file, "start", alarm=str(alarm_path), **({"run_id": run_id} if run_id else {}))
-
-    alarm = _load_alarm(alarm_path)
-    _write_audit_line(audit_file, "alarm_loaded", id=alarm.get("id"), **({"run_id": run_id} if run_id else {}))
-
-    ctx_dir = out_dir / "context"
-    ctx_meta = build_context(alarm, REPO_ROOT, ctx_dir)
-    _write_audit_line(audit_file, "context_built", **ctx_meta, **({"run_id": run_id} if run_id else {}))
-
-    probes = gather_probes(alarm.get("device", "127.0.0.1"), REPO_ROOT, offline=offline)
-    (ctx_dir / "probes.json").write_text(json.dumps(probes, indent=2), encoding="utf-8")
-    _write_audit_line(audit_file, "probes_gathered", offline=offline, **({"run_id": run_id} if run_id else {}))
-
-    insights = build_insights(alarm)
-    _write_audit_line(audit_file, "insights_ready", **({"run_id": run_id} if run_id else {}))
-
-    payload = build_snow_payload(alarm, insights)
-    write_payload(payload, out_dir / "snow_draft.json")
-    write_insights_md(insights, out_dir / "snow_draft.md")
-    _write_audit_line(audit_file, "snow_draft_written", **({"run_id": run_id} if run_id else {}))
-
-    # validation (include ping_loss placeholder deterministic 0)
-    validation = {
-        "alarm_id": alarm.get("id"),
-        "offline": offline,
-    }
-    # When offline (demo) inject synthetic realistic metrics
-    if offline:
-        validation.update(synth_metrics(str(alarm.get("id"))))
-    (out_dir / "validation.json").write_text(json.dumps(validation, indent=2), encoding="utf-8")
-    _write_audit_line(audit_file, "validation_written", **({"run_id": run_id} if run_id else {}))
-
-    if emit_draft:
-        draft_text = make_draft(alarm, validation)
-        (out_dir / "draft.md").write_text(draft_text, encoding="utf-8")
-        _write_audit_line(audit_file, "draft_written", **({"run_id": run_id} if run_id else {}))
-
-    pack_zip = _zip_pack(out_dir)
-    _write_audit_line(audit_file, "pack_zipped", pack=str(pack_zip), **({"run_id": run_id} if run_id else {}))
-
+    # Everything is written into a private sibling dir and published by rename
+    # at the end (see _publish_dir), so readers (UI, CI upload) never see a
+    # half-written artifact; on a rerun each artifact is swapped individually,
+    # not the whole dir at once. Resolved first: "." / ".." have no name to build
+    # the sibling work dir from.
+    target = out_dir.resolve()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    work = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    work.mkdir()
+    try:
+        audit = _AuditLog(work / "audit.jsonl", run_id)
+        prev_audit = out_dir / "audit.jsonl"
+        if prev_audit.is_file():  # audit history accumulates across runs
+            shutil.copyfile(prev_audit, audit.path)
+        audit.event("start", alarm=str(alarm_path))
+
+        if alarm is None:
+            alarm = _load_alarm(alarm_path)
+        audit.event("alarm_loaded", id=alarm.get("id"))
+
+        ctx_dir = work / "context"
+        ctx_meta = build_context(alarm, REPO_ROOT, ctx_dir)
+        audit.event("context_built", **ctx_meta)
+
+        probes = gather_probes(alarm.get("device", "127.0.0.1"), REPO_ROOT, offline=offline)
+        jsonio.write_file(ctx_dir / "probes.json", jsonio.dumps(probes, indent=True))
+        audit.event("probes_gathered", offline=offline)
+
+        insights = build_insights(alarm)
+        audit.event("insights_ready")
+
+        payload = build_snow_payload(alarm, insights)
+        write_payload(payload, work / "snow_draft.json")
+        write_insights_md(insights, work / "snow_draft.md")
+        audit.event("snow_draft_written")
+
+        # validation (include ping_loss placeholder deterministic 0)
+        validation = {
+            "alarm_id": alarm.get("id"),
+            "offline": offline,
+        }
+        # When offline (demo) inject synthetic realistic metrics
+        if offline:
+            validation.update(synth_metrics(str(alarm.get("id"))))
+        jsonio.write_file(work / "validation.json", jsonio.dumps(validation, indent=True))
+        audit.event("validation_written")
+
+        if emit_draft:
+            draft_text = make_draft(alarm, validation)
+            jsonio.write_file(work / "draft.md", draft_text.encode("utf-8"))
+            audit.event("draft_written")
+
+        audit.flush()  # the pack carries the log up to this point
+        # one walk serves both the zip and the returned manifest
+        members = _walk_files(work)
+        pack_zip = out_dir / _zip_pack(work, members, target.name, compress=pack_compress).name
+        audit.event("pack_zipped", pack=str(pack_zip))
+        audit.flush()
+        _publish_dir(work, target, pack_zip.name)
+    except BaseException:
+        shutil.rmtree(work, ignore_errors=True)
+        raise
+
+    out_s = str(out_dir)
     return {
         "alarm": alarm,
         "out_dir": str(out_dir),
-        "files": [str(p) for p in out_dir.rglob("*") if p.is_file()],
+        "files": [os.path.join(out_s, rel) for rel in members] + [str(pack_zip)],
     }
 
 
@@ -120,59 +379,94 @@ def triage_batch(
     offline: bool = False,
     emit_draft: bool = True,
     run_id: str | None = None,
+    workers: int = BATCH_WORKERS,
+    pack_compress: bool = False,
 ) -> Dict[str, Any]:
     out_dir.mkdir(parents=True, exist_ok=True)
-    alarm_files = sorted(glob.glob(pattern))
     results: List[Dict[str, Any]] = []
-    for alarm_file in alarm_files:
-        ap = Path(alarm_file)
-        try:
-            data = json.loads(ap.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            continue
-        if not isinstance(data, dict) or "id" not in data:
-            continue
-        single_dir = out_dir / ap.stem
-        res = triage_one(ap, single_dir, offline=offline, emit_draft=emit_draft, run_id=run_id)
-        results.append(res)
+    # Alarms are independent and online probes mostly wait on subprocesses,
+    # so a bounded thread pool overlaps them; order is restored by id below.
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futs = []
+        for ap, alarm in iter_alarm_candidates(pattern):
+            single_dir = out_dir / ap.stem
+            futs.append(
+                ex.submit(
+                    triage_one,
+                    ap,
+                    single_dir,
+                    offline=offline,
+                    emit_draft=emit_draft,
+                    run_id=run_id,
+                    alarm=alarm,
+                    pack_compress=pack_compress,
+                )
+            )
+        for fut in as_completed(futs):
+            results.append(fut.result())
+    results.sort(key=lambda r: str(r["alarm"].get("id")))
     return {"count": len(results), "alarms": [r["alarm"].get("id") for r in results]}
 
 
-@app.callback(invoke_without_command=True)
-def cli(
-    alarm: str = typer.Option(None, "--alarm", help="Path to single alarm JSON file"),
-    alarms: str = typer.Option(None, "--alarms", help="Glob pattern for batch triage"),
-    out: str = typer.Option(..., "--out", help="Output directory (single or batch root)"),
-    offline: bool = typer.Option(False, "--offline", help="Use offline demo data"),
-    emit_draft: bool = typer.Option(True, "--emit-draft/--no-emit-draft", help="Write draft.md artifact"),
-):
-    """Process a single alarm or a batch (core artifact ownership)."""
-    if alarm and alarms:
-        raise typer.BadParameter("Specify either --alarm or --alarms, not both")
-    if not alarm and not alarms:
-        raise typer.BadParameter("One of --alarm or --alarms is required")
-    if alarm:
-        result = triage_one(Path(alarm), Path(out), offline=offline, emit_draft=emit_draft)
-        typer.echo(json.dumps({"status": "ok", "files": len(result["files"])}, indent=2))
-    else:
-        summary = triage_batch(alarms, Path(out), offline=offline, emit_draft=emit_draft)
-        typer.echo(json.dumps(summary, indent=2))
+def build_app():
+    """Build the Typer CLI.
+
+    typer (click, rich, ...) is imported here rather than at module level so
+    library callers -- batch workers, the UI, tests -- don't pay its import
+    cost.
+    """
+    import typer
+
+    app = typer.Typer(add_completion=False, help="Offline-friendly alarm triage")
+
+    @app.callback(invoke_without_command=True)
+    def cli(
+        alarm: str = typer.Option(None, "--alarm", help="Path to single alarm JSON file"),
+        alarms: str = typer.Option(None, "--alarms", help="Glob pattern for batch triage"),
+        out: str = typer.Option(..., "--out", help="Output directory (single or batch root)"),
+        offline: bool = typer.Option(False, "--offline", help="Use offline demo data"),
+        emit_draft: bool = typer.Option(True, "--emit-draft/--no-emit-draft", help="Write draft.md artifact"),
+        pack_compress: bool = typer.Option(
+            False, "--pack-compress/--no-pack-compress", help="Deflate larger members of the alarm zip pack"
+        ),
+    ):
+        """Process a single alarm or a batch (core artifact ownership)."""
+        if alarm and alarms:
+            raise typer.BadParameter("Specify either --alarm or --alarms, not both")
+        if not alarm and not alarms:
+            raise typer.BadParameter("One of --alarm or --alarms is required")
+        if alarm:
+            result = triage_one(
+                Path(alarm), Path(out), offline=offline, emit_draft=emit_draft, pack_compress=pack_compress
+            )
+            typer.echo(json.dumps({"status": "ok", "files": len(result["files"])}, indent=2))
+        else:
+            summary = triage_batch(
+                alarms, Path(out), offline=offline, emit_draft=emit_draft, pack_compress=pack_compress
+            )
+            typer.echo(json.dumps(summary, indent=2))
+
+    return app
+
+
+def __getattr__(name: str):
+    if name == "app":  # old module-level attribute, now built on demand
+        return build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():  # pragma: no cover - entrypoint
-    app()
+    build_app()()
 
 
 if __name__ == "__main__":  # pragma: no cover
     main()
 
 # --- Back-compat shims (do not remove until next major) -----------------------
-from pathlib import Path as _Path  # noqa: E402
-
 def process_alarm(alarm_path, out_dir, offline: bool = True, emit_draft: bool = True):  # type: ignore
     """Compat shim: old name -> triage_one"""
-    return triage_one(_Path(alarm_path), _Path(out_dir), offline=offline, emit_draft=emit_draft)
+    return triage_one(Path(alarm_path), Path(out_dir), offline=offline, emit_draft=emit_draft)
 
 def process_batch(alarms_glob, out_root, offline: bool = True, emit_draft: bool = True):  # type: ignore
     """Compat shim: old name -> triage_batch"""
-    return triage_batch(alarms_glob, _Path(out_root), offline=offline, emit_draft=emit_draft)
+    return triage_batch(alarms_glob, Path(out_root), offline=offline, emit_draft=emit_draft)
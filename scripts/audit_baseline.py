@@ -1,20 +1,36 @@
 from __future__ import annotations
 import re
 import csv
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 import typer
 from rich import print
 from rich.table import Table
 import yaml
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _SafeLoader
+
 app = typer.Typer(help="Audit configs against a simple baseline.")
 
 def load_baseline(path: Path) -> dict:
-    return yaml.safe_load(path.read_text())
+    return yaml.load(path.read_bytes(), Loader=_SafeLoader)
+
+def config_files(configs_dir: Path) -> list[Path]:
+    return sorted(configs_dir.glob("*.cfg"))
 
-def read_configs(configs_dir: Path) -> list[tuple[str, str]]:
-    files = sorted(p for p in configs_dir.glob("*.cfg"))
-    return [(p.stem, p.read_text(encoding="utf-8", errors="ignore")) for p in files]
+def read_config(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern[str]:
+    # profiles are checked against every config; compile each rule once
+    return re.compile(pattern, re.MULTILINE)
 
 def check_profile(cfg: str, profile: dict) -> dict:
     findings = {"pass": True, "details": []}
@@ -35,25 +51,28 @@ def check_profile(cfg: str, profile: dict) -> dict:
         must_not_include(s)
 
     for item in profile.get("regex_require", []):
-        pat = re.compile(item["pattern"], re.MULTILINE)
-        if not pat.search(cfg):
+        if not _compile(item["pattern"]).search(cfg):
             findings["pass"] = False
             findings["details"].append(f"MISSING_RE: {item['pattern']}")
 
     for item in profile.get("regex_forbid", []):
-        pat = re.compile(item["pattern"], re.MULTILINE)
-        if pat.search(cfg):
+        if _compile(item["pattern"]).search(cfg):
             findings["pass"] = False
             findings["details"].append(f"FORBID_RE: {item['pattern']}")
 
     return findings
 
+def check_config_file(path: Path, profile: dict) -> dict:
+    """Read and check one config (pool workers load their own files)."""
+    return check_profile(read_config(path), profile)
+
 @app.command()
 def main(
     configs: Path = typer.Option(Path("configs/latest"), "--configs", help="Folder of .cfg files"),
     baseline: Path = typer.Option(Path("baseline.yaml"), "--baseline", help="Baseline rules YAML"),
     profile: str = typer.Option("cisco_ios", "--profile", help="Profile key under baseline.profiles"),
     report: Path = typer.Option(Path("reports/baseline_report.csv"), "--report", help="CSV report path"),
+    workers: int = typer.Option(0, "--workers", "-w", help="Parallel worker processes (0 = CPU count)"),
 ):
     if not configs.exists():
         raise typer.BadParameter(f"Configs dir not found: {configs}")
@@ -70,8 +89,20 @@ def main(
     table.add_column("Status")
     table.add_column("Details")
 
-    for dev, text in read_configs(configs):
-        res = check_profile(text, prof)
+    files = config_files(configs)
+    # Each config is independent CPU-bound regex work: spread it over processes
+    # (workers read their own file, so config text never piles up here)
+    if workers == 1 or len(files) < 2:
+        results = [check_config_file(p, prof) for p in files]
+    else:
+        # no more workers than files; ~4 chunks per worker keeps them all busy
+        max_workers = min(len(files), workers or os.cpu_count() or 1)
+        chunksize = max(1, len(files) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            results = list(ex.map(check_config_file, files, repeat(prof), chunksize=chunksize))
+
+    for p, res in zip(files, results):
+        dev = p.stem
         status = "PASS" if res["pass"] else "FAIL"
         table.add_row(dev, "[green]PASS" if res["pass"] else "[red]FAIL", "; ".join(res["details"]))
         rows.append({"device": dev, "status": status, "details": " | ".join(res["details"])})
@@ -3,10 +3,10 @@ import shutil
 import typer
 from rich import print
 from rich.table import Table
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
-from scripts.utils import load_devices, get_password, make_stamp_dir, ios_run_cmd, connect, enable_if_needed, atomic_write
+from scripts.utils import load_devices, get_password, make_stamp_dir, ios_show_running, connect, enable_if_needed, atomic_write
 
 app = typer.Typer(help="Backup running configs in parallel or from local demo files.")
 
@@ -19,7 +19,7 @@ def backup_one(out_dir: Path, device, password: str) -> Tuple[str, str, bool, st
         conn = connect(device, password)
         enable_if_needed(conn, device)
         cmd = DEFAULT_SHOW.get(device.platform, "show running-config")
-        cfg = ios_run_cmd(conn, cmd)
+        cfg = ios_show_running(conn, cmd)
         conn.disconnect()
         fname = f"{device.name}_{device.ip}_{device.platform}.cfg"
         atomic_write(out_dir / fname, cfg)
@@ -42,11 +42,12 @@ def main(
         table.add_column("Source")
         table.add_column("Dest")
         ok = 0
-        for p in sorted(Path(offline_from).glob("*.cfg")):
-            dest = day_dir / p.name
-            shutil.copy2(p, dest)
-            table.add_row(str(p), str(dest))
-            ok += 1
+        sources = sorted(Path(offline_from).glob("*.cfg"))
+        # copyfile already uses sendfile() on Linux; the pool overlaps files
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for p, dest in zip(sources, ex.map(lambda src: shutil.copyfile(src, day_dir / src.name), sources)):
+                table.add_row(str(p), str(dest))
+                ok += 1
         print(table)
         print(f"[bold]{ok} file(s) copied[/bold]")
         return
@@ -55,11 +56,11 @@ def main(
     devices = load_devices(inventory)
     password = get_password()
 
-    results: List[Tuple[str, str, bool, str]] = []
+    # map() hands results back in inventory order, so no sort is needed below
     with ThreadPoolExecutor(max_workers=workers) as ex:
-        futs = [ex.submit(backup_one, day_dir, d, password) for d in devices]
-        for fut in as_completed(futs):
-            results.append(fut.result())
+        results: List[Tuple[str, str, bool, str]] = list(
+            ex.map(lambda d: backup_one(day_dir, d, password), devices)
+        )
 
     table = Table(title=f"Backups → {day_dir}")
     table.add_column("Device")
@@ -67,7 +68,7 @@ def main(
     table.add_column("Status")
     table.add_column("Note")
     ok = 0
-    for name, ip, success, note in sorted(results):
+    for name, ip, success, note in results:
         table.add_row(name, ip, "[green]OK" if success else "[red]FAIL", note)
         ok += 1 if success else 0
     print(table)
@@ -3,22 +3,37 @@ import re
 from pathlib import Path
 from typing import List, Dict, Any
 import difflib
+import functools
 import typer
 from rich import print
 from rich.table import Table
-import json
 import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from scripts import __version__ as tool_version
 from scripts.utils import (
     load_devices, get_password, connect, enable_if_needed,
-    ios_run_cmd, ios_config_set, atomic_write, ensure_dir, save_ios
+    ios_show_running, ios_config_set, atomic_write, atomic_write_json, ensure_dir, save_ios
 )
 
 app = typer.Typer(help="Push standard changes with dry-run and diffs. Supports offline demo mode.")
 
+# Transform patterns, compiled once instead of per call / per config line
+_NTP_CAPTURE_RE = re.compile(r"^ntp\s+server\s+(\S+)", re.MULTILINE)
+_NTP_LINE_RE = re.compile(r"^ntp\s+server\s+\S+\s*$")
+_BANNER_RE = re.compile(r"^banner login \^C.*?\^C\s*$", re.MULTILINE | re.DOTALL)
+_HTTP_SERVER_RE = re.compile(r'^\s*ip http server(?:\b.*)?\s*$', re.MULTILINE)
+_NO_HTTP_SERVER_RE = re.compile(r'^\s*no ip http server\b', re.MULTILINE)
+_BLANK_RUN_RE = re.compile(r'\n{3,}')
+_TELNET_RE = re.compile(r"^\s*transport input\s+telnet\s*$", re.MULTILINE)
+
 def parse_ntp(cfg: str) -> set[str]:
-    return {m.group(1) for m in re.finditer(r"^ntp\\s+server\\s+(\\S+)", cfg, flags=re.MULTILINE)}
+    # Only lines starting with "ntp" can match; skip the regex for everything else
+    return {
+        m.group(1)
+        for ln in cfg.split("\n") if ln.startswith("ntp")
+        for m in (_NTP_CAPTURE_RE.match(ln),) if m
+    }
 
 def build_ntp_commands(current: set[str], desired: List[str], enforce: bool) -> List[str]:
     desired_set = set(desired)
@@ -37,6 +52,8 @@ def build_banner_commands(banner: str | None) -> List[str]:
     return ["banner login ^C" + banner + "^C"]
 
 def unified_diff_text(before: str, after: str, name: str) -> str:
+    if before == after:  # difflib would produce nothing; skip the matcher
+        return ""
     diff = difflib.unified_diff(
         before.splitlines(keepends=True),
         after.splitlines(keepends=True),
@@ -46,7 +63,9 @@ def unified_diff_text(before: str, after: str, name: str) -> str:
     )
     return "".join(diff)
 
+@functools.lru_cache(maxsize=1)
 def get_git_rev() -> str:
+    # HEAD can't move during one run; spawn git at most once
     try:
         return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
@@ -55,93 +74,84 @@ def get_git_rev() -> str:
 def sha256_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
+_HASH_CHUNK = 1 << 20  # 1 MiB reads for the pre-3.11 hashing fallback
+
 def sha256_file(path: Path) -> str:
     try:
-        h = hashlib.sha256()
         with path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+            if hasattr(hashlib, "file_digest"):  # 3.11+: read/update loop runs in C
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
                 h.update(chunk)
-        return h.hexdigest()
+            return h.hexdigest()
     except FileNotFoundError:
         return ""
 
+def _fenced(body: List[str], fence: str = "```") -> str:
+    return "\n".join([fence, *body, "```"])
+
 def render_plan_md(plan: Dict[str, Any]) -> str:
-    lines: List[str] = []
-    lines.append(f"# Change Plan — {plan.get('device','unknown')}")
-    lines.append("")
-    # Intent
-    lines.append("## Intent")
+    # Sections are built as blocks and dropped into one template
     intent = plan.get("intent", {})
-    if not intent:
-        lines.append("(no changes)")
-    else:
-        for k in sorted(intent.keys()):
-            v = intent[k]
-            v_str = ", ".join(map(str, v)) if isinstance(v, list) else str(v)
-            lines.append(f"- {k}: {v_str}")
-    lines.append("")
-    # Inputs
-    lines.append("## Inputs")
+    intent_block = "\n".join(
+        f"- {k}: {', '.join(map(str, v)) if isinstance(v, list) else v}"
+        for k, v in sorted(intent.items())
+    ) or "(no changes)"
+
     inputs = plan.get("inputs", {})
     before = inputs.get("before", {})
     after = inputs.get("after", {})
-    lines.append(f"- before: {before.get('path','')} (sha256: {before.get('sha256','')})")
-    lines.append(f"- after: {after.get('path','')} (sha256: {after.get('sha256','')})")
-    lines.append("")
-    # Commands
-    lines.append("## Commands to Apply")
+
     cmds: List[str] = plan.get("commands", [])
-    if cmds:
-        lines.append("```")
-        lines.extend(cmds)
-        lines.append("```")
-    else:
-        lines.append("(none)")
-    lines.append("")
-    # Diff
-    lines.append("## Unified Diff")
+    cmds_block = _fenced(cmds) if cmds else "(none)"
+
     diff_text = plan.get("diff", "")
-    if diff_text:
-        lines.append("```diff")
-        lines.append(diff_text.rstrip("\n"))
-        lines.append("```")
-    else:
-        lines.append("(no diff)")
+    diff_block = _fenced([diff_text.rstrip("\n")], "```diff") if diff_text else "(no diff)"
     diff_path = plan.get("diff_path", "")
     if diff_path:
-        lines.append("")
-        lines.append(f"Diff path: {diff_path}")
-    lines.append("")
-    # Rollback
-    lines.append("## Rollback")
+        diff_block += f"\n\nDiff path: {diff_path}"
+
     rollback = plan.get("rollback", [])
-    if rollback:
-        lines.append("```")
-        lines.extend(rollback)
-        lines.append("```")
-    else:
-        lines.append("(refer to restoring the 'before' configuration)")
-    lines.append("")
-    # Post-Checks
-    lines.append("## Post-Checks")
+    rollback_block = _fenced(rollback) if rollback else "(refer to restoring the 'before' configuration)"
+
     post = plan.get("post_checks", {})
     report = post.get("report", "")
     summary = post.get("summary", {})
-    if report or summary:
-        if report:
-            lines.append(f"report: {report}")
-        if summary:
-            lines.append(f"summary: passed={summary.get('passed',0)}, failed={summary.get('failed',0)}")
-    else:
-        lines.append("(not available)")
-    lines.append("")
-    # Provenance
+    post_lines: List[str] = []
+    if report:
+        post_lines.append(f"report: {report}")
+    if summary:
+        post_lines.append(f"summary: passed={summary.get('passed',0)}, failed={summary.get('failed',0)}")
+    post_block = "\n".join(post_lines) or "(not available)"
+
     prov = plan.get("provenance", {})
-    lines.append("## Provenance")
-    lines.append(f"- tool_version: {prov.get('tool_version','')}")
-    lines.append(f"- git_rev: {prov.get('git_rev','')}")
-    lines.append(f"- offline: {prov.get('offline', False)}")
-    return "\n".join(lines) + "\n"
+    return f"""# Change Plan — {plan.get('device','unknown')}
+
+## Intent
+{intent_block}
+
+## Inputs
+- before: {before.get('path','')} (sha256: {before.get('sha256','')})
+- after: {after.get('path','')} (sha256: {after.get('sha256','')})
+
+## Commands to Apply
+{cmds_block}
+
+## Unified Diff
+{diff_block}
+
+## Rollback
+{rollback_block}
+
+## Post-Checks
+{post_block}
+
+## Provenance
+- tool_version: {prov.get('tool_version','')}
+- git_rev: {prov.get('git_rev','')}
+- offline: {prov.get('offline', False)}
+"""
 
 def collect_post_checks() -> Dict[str, Any]:
     # Try to read a standard after-baseline report if present
@@ -151,8 +161,10 @@ def collect_post_checks() -> Dict[str, Any]:
         # Deterministic simple tally: count lines with PASS/FAIL if present
         try:
             text = report_csv.read_text(encoding="utf-8", errors="ignore")
-            passed = sum(1 for ln in text.splitlines() if ",PASS" in ln)
-            failed = sum(1 for ln in text.splitlines() if ",FAIL" in ln)
+            passed = failed = 0
+            for ln in text.splitlines():  # one pass for both tallies
+                passed += ",PASS" in ln
+                failed += ",FAIL" in ln
             result = {"report": str(report_csv), "summary": {"passed": passed, "failed": failed}}
         except Exception:
             result = {"report": str(report_csv)}
@@ -161,12 +173,18 @@ def collect_post_checks() -> Dict[str, Any]:
 
 # ---------- Offline text transforms (idempotent) ----------
 def apply_ntp_to_config(text: str, desired: List[str], enforce: bool) -> str:
-    lines = text.splitlines()
-    if enforce:
-        lines = [ln for ln in lines if not re.match(r"^ntp\\s+server\\s+\\S+\\s*$", ln)]
-        current: set[str] = set()
-    else:
-        current = parse_ntp("\n".join(lines))
+    # One pass: note the servers present, dropping unwanted ones when enforcing.
+    # Desired servers stay where they are so a re-run leaves the config alone.
+    wanted = set(desired)
+    lines: List[str] = []
+    current: set[str] = set()
+    for ln in text.splitlines():
+        m = _NTP_CAPTURE_RE.match(ln) if ln.startswith("ntp") else None
+        if m:
+            if enforce and m.group(1) not in wanted and _NTP_LINE_RE.match(ln):
+                continue
+            current.add(m.group(1))
+        lines.append(ln)
     for s in desired:
         if s and (s not in current):
             lines.append(f"ntp server {s}")
@@ -176,48 +194,89 @@ def apply_ntp_to_config(text: str, desired: List[str], enforce: bool) -> str:
 def apply_banner_to_config(text: str, banner: str | None) -> str:
     if not banner:
         return text
-    cleaned = re.sub(r"^banner login \\^C.*?\\^C\\s*$", "", text, flags=re.MULTILINE | re.DOTALL).rstrip("\n")
-    if cleaned and not cleaned.endswith("\n\n"):
-        cleaned += "\n\n"
-    elif not cleaned:
-        cleaned = ""
-    cleaned += f"banner login ^C{banner.strip()}^C\n"
-    return cleaned if cleaned.endswith("\n") else cleaned + "\n"
+    line = f"banner login ^C{banner.strip()}^C"
+    if [m.group(0).rstrip() for m in _BANNER_RE.finditer(text)] == [line]:
+        # already the only banner: keep it in place
+        return text if text.endswith("\n") else text + "\n"
+    cleaned = _BANNER_RE.sub("", text).rstrip("\n")
+    # build the result in one go (cleaned never ends in a newline after rstrip)
+    sep = "\n\n" if cleaned else ""
+    return f"{cleaned}{sep}{line}\n"
+
+def apply_fixers(
+    text: str,
+    disable_http: bool = False,
+    ssh_v2: bool = False,
+    transport_ssh: bool = False,
+    timestamps: bool = False,
+) -> str:
+    """Apply the enabled baseline fixers in one go.
+
+    Line rewrites run first; every line that still has to be added is then
+    appended in one step instead of re-copying the whole config per fixer.
+    """
+    if not (disable_http or ssh_v2 or transport_ssh or timestamps):
+        return text
+    t = text
+    tail: List[str] = []
+    if disable_http:
+        # Each regex needs a literal that a plain substring test can rule out
+        # first, so configs without it skip that scan entirely.
+        # Remove ALL enabled http server lines (handles leading spaces and any suffix)
+        if "ip http server" in t:
+            t = _HTTP_SERVER_RE.sub('', t)
+        # Collapse excessive blank lines introduced
+        if "\n\n\n" in t:
+            t = _BLANK_RUN_RE.sub('\n\n', t)
+        # Ensure explicit disable line exists once
+        if "no ip http server" not in t or _NO_HTTP_SERVER_RE.search(t) is None:
+            tail.append("no ip http server")
+    if ssh_v2 and "ip ssh version 2" not in t:
+        tail.append("ip ssh version 2")
+    if transport_ssh:
+        # Replace telnet with ssh if present; otherwise ensure one 'transport input ssh' exists
+        t = _TELNET_RE.sub(" transport input ssh", t)
+        if "transport input ssh" not in t:
+            tail.append("transport input ssh")
+    if timestamps and "service timestamps log datetime msec" not in t:
+        tail.append("service timestamps log datetime msec")
+    if tail:
+        return t.rstrip("\n") + "\n" + "\n".join(tail) + "\n"
+    return t if t.endswith("\n") else t + "\n"
 
 def apply_disable_http(text: str, disable: bool) -> str:
-    if not disable:
-        return text
-    # Remove ALL enabled http server lines (handles leading spaces and any suffix)
-    t = re.sub(r'^\s*ip http server(?:\b.*)?\s*$', '', text, flags=re.MULTILINE)
-    # Collapse excessive blank lines introduced
-    t = re.sub(r'\n{3,}', '\n\n', t)
-    # Ensure explicit disable line exists once
-    if re.search(r'^\s*no ip http server\b', t, flags=re.MULTILINE) is None:
-        t = (t.rstrip('\n') + '\nno ip http server\n')
-    return t if t.endswith('\n') else t + '\n'
+    return apply_fixers(text, disable_http=disable)
 
 def apply_ssh_v2(text: str, enable: bool) -> str:
-    if not enable:
-        return text
-    if "ip ssh version 2" not in text:
-        text = (text.rstrip("\n") + "\nip ssh version 2\n")
-    return text if text.endswith("\n") else text + "\n"
+    return apply_fixers(text, ssh_v2=enable)
 
 def apply_transport_ssh(text: str, enable: bool) -> str:
-    if not enable:
-        return text
-    # Replace telnet with ssh if present; otherwise ensure one 'transport input ssh' exists
-    t = re.sub(r"^\\s*transport input\\s+telnet\\s*$", " transport input ssh", text, flags=re.MULTILINE)
-    if "transport input ssh" not in t:
-        t = (t.rstrip("\n") + "\ntransport input ssh\n")
-    return t if t.endswith("\n") else t + "\n"
+    return apply_fixers(text, transport_ssh=enable)
 
 def apply_timestamps(text: str, enable: bool) -> str:
-    if not enable:
-        return text
-    if "service timestamps log datetime msec" not in text:
-        text = (text.rstrip("\n") + "\nservice timestamps log datetime msec\n")
-    return text if text.endswith("\n") else text + "\n"
+    return apply_fixers(text, timestamps=enable)
+
+def apply_offline_transforms(
+    text: str,
+    desired_ntp: List[str],
+    enforce: bool,
+    banner: str | None,
+    disable_http: bool = False,
+    fix_ssh: bool = False,
+    timestamps: bool = False,
+) -> str:
+    """BEFORE text -> AFTER text for offline mode; feeding AFTER back in is a no-op."""
+    if desired_ntp:
+        text = apply_ntp_to_config(text, desired_ntp, enforce)
+    if banner:
+        text = apply_banner_to_config(text, banner)
+    return apply_fixers(
+        text,
+        disable_http=disable_http,
+        ssh_v2=fix_ssh,
+        transport_ssh=fix_ssh,
+        timestamps=timestamps,
+    )
 # ----------------------------------------------------------
 
 @app.command()
@@ -240,6 +299,7 @@ def main(
     fix_ssh: bool = typer.Option(False, "--fix-ssh", help="Ensure 'ip ssh version 2' and 'transport input ssh'"),
     disable_http: bool = typer.Option(False, "--disable-http", help="Remove 'ip http server'"),
     timestamps: bool = typer.Option(False, "--timestamps", help="Ensure 'service timestamps log datetime msec'"),
+    workers: int = typer.Option(8, "--workers", "-w", help="Parallel device sessions (live mode)"),
 ):
     desired_ntp = [s.strip() for s in ntp.split(",") if s.strip()] if ntp else []
     diffs_dir = ensure_dir(diffs)
@@ -252,7 +312,10 @@ def main(
     if offline:
         if not before or not before.exists():
             raise typer.BadParameter("--before must point to a .cfg file in offline mode")
-        before_text = before.read_text(encoding="utf-8", errors="ignore")
+        # Read once: the bytes are hashed for the plan, the text is transformed.
+        # (decode + newline normalisation matches what read_text() did)
+        before_bytes = before.read_bytes()
+        before_text = before_bytes.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
 
         # Build "cmds" for display only (what we'd do on a live device)
         cmds: List[str] = []
@@ -271,18 +334,10 @@ def main(
         print(table)
 
         # Apply transforms to produce AFTER text
-        after_text = before_text
-        if desired_ntp:
-            after_text = apply_ntp_to_config(after_text, desired_ntp, enforce)
-        if banner:
-            after_text = apply_banner_to_config(after_text, banner)
-        if disable_http:
-            after_text = apply_disable_http(after_text, True)
-        if fix_ssh:
-            after_text = apply_ssh_v2(after_text, True)
-            after_text = apply_transport_ssh(after_text, True)
-        if timestamps:
-            after_text = apply_timestamps(after_text, True)
+        after_text = apply_offline_transforms(
+            before_text, desired_ntp, enforce, banner,
+            disable_http=disable_http, fix_ssh=fix_ssh, timestamps=timestamps,
+        )
 
         # Diff (always compute; write if not empty or if a plan is requested)
         diff_text = unified_diff_text(before_text, after_text, name)
@@ -312,7 +367,7 @@ def main(
             # Paths and hashes
             after_path = (ensure_dir(after_out) / f"{name}.cfg") if write_after else None
             inputs = {
-                "before": {"path": str(before), "sha256": sha256_file(before)},
+                "before": {"path": str(before), "sha256": hashlib.sha256(before_bytes).hexdigest()},
                 "after": {
                     "path": str(after_path) if after_path else "",
                     # If not written to disk, hash the computed text deterministically
@@ -344,7 +399,7 @@ def main(
 
             if plan_json:
                 ensure_dir(Path(plan_json).parent)
-                atomic_write(Path(plan_json), json.dumps(plan, indent=2, sort_keys=True) + "\n")
+                atomic_write_json(Path(plan_json), plan, indent=2, sort_keys=True)
                 print(f"JSON plan written to: [bold]{plan_json}[/bold]")
             if plan_out:
                 ensure_dir(Path(plan_out).parent)
@@ -358,15 +413,17 @@ def main(
 
         return
 
-    # -------- LIVE MODE (unchanged behavior) --------
+    # -------- LIVE MODE --------
     devices = load_devices(inventory)
     password = get_password()
 
-    for d in devices:
+    def push_one(d) -> List[tuple[str, str]]:
+        # Table rows for one device; Rich tables are filled on the main thread
+        rows: List[tuple[str, str]] = []
         try:
             conn = connect(d, password)
             enable_if_needed(conn, d)
-            before = ios_run_cmd(conn, "show running-config")
+            before = ios_show_running(conn)
 
             cmds: List[str] = []
             if desired_ntp:
@@ -380,18 +437,26 @@ def main(
             if timestamps:
                 cmds.append("service timestamps log datetime msec")
 
-            table.add_row(d.name, "\n".join(cmds) if cmds else "(no changes)")
+            rows.append((d.name, "\n".join(cmds) if cmds else "(no changes)"))
 
             if not dry_run and cmds:
                 ios_config_set(conn, cmds)
                 save_ios(conn)
-                after = ios_run_cmd(conn, "show running-config")
+                after = ios_show_running(conn)
                 diff_text = unified_diff_text(before, after, d.name)
                 atomic_write(diffs_dir / f"{d.name}.diff", diff_text)
 
             conn.disconnect()
         except Exception as e:
-            table.add_row(d.name, f"ERROR: {e}")
+            rows.append((d.name, f"ERROR: {e}"))
+        return rows
+
+    # Devices are independent and SSH-bound: work on several at once,
+    # reporting in inventory order.
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for rows in ex.map(push_one, devices):
+            for row in rows:
+                table.add_row(*row)
 
     print(table)
     if dry_run:
@@ -1,14 +1,21 @@
 from __future__ import annotations
+import json
 import os
+import re
 import time
 import yaml
 import shutil
 from pathlib import Path
 from typing import List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from tenacity import retry, stop_after_attempt, wait_fixed
 from netmiko import ConnectHandler
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _SafeLoader
+
 CONFIG_LATEST = "configs/latest"
 
 class Device(BaseModel):
@@ -32,9 +39,12 @@ class Device(BaseModel):
             "banner_timeout": 20,
         }
 
+# validates the whole inventory in one pydantic-core call
+_DEVICES_ADAPTER = TypeAdapter(List[Device])
+
 def load_devices(inventory_path: str | Path) -> List[Device]:
-    data = yaml.safe_load(Path(inventory_path).read_text())
-    return [Device(**item) for item in data]
+    data = yaml.load(Path(inventory_path).read_bytes(), Loader=_SafeLoader)
+    return _DEVICES_ADAPTER.validate_python(data)
 
 def get_password() -> str:
     pw = os.getenv("NET_PASS")
@@ -47,23 +57,45 @@ def ensure_dir(p: str | Path) -> Path:
     p.mkdir(parents=True, exist_ok=True)
     return p
 
-def atomic_write(path: Path, content: str) -> None:
+def atomic_write(path: Path, content: str | bytes) -> None:
+    # str is encoded once (with the newline translation write_text would do)
+    # and written as bytes; bytes are written as-is.
+    if isinstance(content, str):
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        content = content.encode("utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+def atomic_write_json(path: Path, obj: Any, **dump_kwargs: Any) -> None:
+    # json.dump streams into the file instead of building the whole string first
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content, encoding="utf-8")
-    tmp.replace(path)
+    with tmp.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+        json.dump(obj, fp, **dump_kwargs)
+        fp.write("\n")
+    os.replace(tmp, path)
 
 def make_stamp_dir(root: str | Path) -> Path:
     root = ensure_dir(root)
     stamp = time.strftime("%Y-%m-%d")
     day = root / stamp
     ensure_dir(day)
-    # refresh configs/latest (Windows-safe copy instead of symlink)
+    # refresh configs/latest: a relative symlink to today's folder where the
+    # platform allows it (no copying, and files backed up after this call show
+    # up too); otherwise fall back to the Windows-safe copy.
     latest = Path(CONFIG_LATEST)
-    if latest.exists():
-        if latest.is_symlink():
-            latest.unlink(missing_ok=True)
-        else:
-            shutil.rmtree(latest, ignore_errors=True)
+    if latest.is_symlink():
+        latest.unlink(missing_ok=True)
+    elif latest.exists():
+        shutil.rmtree(latest, ignore_errors=True)
+    if os.name != "nt":
+        try:
+            latest.parent.mkdir(parents=True, exist_ok=True)
+            latest.symlink_to(os.path.relpath(day, latest.parent), target_is_directory=True)
+            return day
+        except OSError:
+            pass
     shutil.copytree(day, latest)
     return day
 
@@ -78,8 +110,20 @@ def enable_if_needed(conn: ConnectHandler, device: Device) -> None:
         except Exception:
             pass
 
-def ios_run_cmd(conn: ConnectHandler, cmd: str) -> str:
-    return conn.send_command(cmd, use_textfsm=False)
+def ios_run_cmd(conn: ConnectHandler, cmd: str, **kwargs: Any) -> str:
+    return conn.send_command(cmd, use_textfsm=False, **kwargs)
+
+def ios_show_running(conn: ConnectHandler, cmd: str = "show running-config") -> str:
+    # Large output, stable prompt: stop reading as soon as our own prompt shows up
+    # instead of netmiko's generic prompt detection; anchored on base_prompt so a
+    # config line ending in '#' can't end the read early.
+    return ios_run_cmd(
+        conn, cmd,
+        expect_string=rf"{re.escape(conn.base_prompt)}[>#]\s*$",
+        read_timeout=60,
+        strip_prompt=True,
+        strip_command=True,
+    )
 
 def ios_config_set(conn: ConnectHandler, lines: List[str]) -> str:
     return conn.send_config_set(lines)
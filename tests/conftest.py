@@ -1,11 +1,32 @@
 import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-import sys, pathlib
-ROOT = pathlib.Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+
+@pytest.fixture
+def process_pool_calls(monkeypatch):
+    """Swap batch's ProcessPoolExecutor for a thread pool and record its use.
+
+    ``sizes`` gets each pool's ``max_workers``; callables appended to ``hooks``
+    run when a pool is created (i.e. right where the fork would happen).
+    """
+    from scripts.alarm_triage import batch
+
+    calls = types.SimpleNamespace(sizes=[], hooks=[])
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            calls.sizes.append(max_workers)
+            for hook in calls.hooks:
+                hook()
+            super().__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", RecordingPool)
+    return calls
@@ -19,3 +19,72 @@ def test_single_alarm_offline(tmp_path: Path):
     snow_md = (out_dir / "snow_draft.md").read_text(encoding="utf-8")
     assert "Blast Radius" in snow_md
     assert "Suggested Next Steps" in snow_md
+
+
+def test_rerun_replaces_outputs_and_keeps_audit(tmp_path: Path):
+    out_dir = tmp_path / "A001"
+    triage_one(Path("demo/alarms/A001.json"), out_dir, offline=True, emit_draft=True)
+    first = (out_dir / "audit.jsonl").read_text(encoding="utf-8").splitlines()
+    res = triage_one(Path("demo/alarms/A001.json"), out_dir, offline=True, emit_draft=False)
+    second = (out_dir / "audit.jsonl").read_text(encoding="utf-8").splitlines()
+    assert second[: len(first)] == first and len(second) > len(first)
+    # published atomically: no work dirs left behind, stale draft.md gone
+    assert [p.name for p in tmp_path.iterdir()] == ["A001"]
+    assert not (out_dir / "draft.md").exists()
+    assert str(out_dir / "A001_pack.zip") in res["files"]
+
+
+def test_rerun_keeps_unrelated_files(tmp_path: Path):
+    out_dir = tmp_path / "A001"
+    (out_dir / "notes").mkdir(parents=True)
+    (out_dir / "notes" / "todo.txt").write_text("keep", encoding="utf-8")
+    (out_dir / "duration_s.txt").write_text("1.00\n", encoding="utf-8")
+    triage_one(Path("demo/alarms/A001.json"), out_dir, offline=True, emit_draft=True)
+    triage_one(Path("demo/alarms/A001.json"), out_dir, offline=True, emit_draft=False)
+    assert (out_dir / "notes" / "todo.txt").read_text(encoding="utf-8") == "keep"
+    assert (out_dir / "duration_s.txt").is_file()
+    assert (out_dir / "validation.json").is_file() and not (out_dir / "draft.md").exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["A001"]
+
+
+def test_out_dot_writes_into_cwd(tmp_path: Path, monkeypatch):
+    alarm = Path("demo/alarms/A001.json").resolve()
+    (tmp_path / "mine.txt").write_text("keep", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    triage_one(alarm, Path("."), offline=True, emit_draft=True)
+    assert (tmp_path / "mine.txt").is_file()
+    assert (tmp_path / "validation.json").is_file()
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+
+def test_zip_level_env_is_validated(monkeypatch):
+    from scripts.alarm_triage.triage import _zip_level_from_env
+
+    for raw, level in (("6", 6), ("10", 9), ("-1", 0), ("fast", 1)):
+        monkeypatch.setenv("TRIAGE_ZIP_LEVEL", raw)
+        assert _zip_level_from_env() == level
+
+
+def test_repo_root_env_validated_and_not_exported(tmp_path: Path, monkeypatch):
+    import os
+    from scripts.alarm_triage import triage
+
+    monkeypatch.setenv("NETAUTO_REPO_ROOT", str(tmp_path))  # no demo/ under it
+    assert triage._find_repo_root() == triage.REPO_ROOT
+    monkeypatch.delenv("NETAUTO_REPO_ROOT")
+    triage._find_repo_root()
+    assert "NETAUTO_REPO_ROOT" not in os.environ
+    with triage.exported_repo_root():
+        assert os.environ["NETAUTO_REPO_ROOT"] == str(triage.REPO_ROOT)
+    assert "NETAUTO_REPO_ROOT" not in os.environ
+
+
+def test_context_ignores_unhashable_device_and_site(tmp_path: Path):
+    from scripts.alarm_triage.context_pack import build_context
+
+    repo = Path(__file__).resolve().parents[1]
+    res = build_context({"device": ["x"], "site": "site001"}, repo, tmp_path / "a")
+    assert res["incidents_count"] > 0  # still matched by site
+    res = build_context({"device": ["x"], "site": {"id": 1}}, repo, tmp_path / "b")
+    assert res["incidents_count"] == 0
+    assert (tmp_path / "b" / "prior_incidents.json").read_text(encoding="utf-8") == "[]"
@@ -11,3 +11,81 @@ def test_batch_offline(tmp_path: Path):
         single = out_dir / alarm_id
         assert (single / "validation.json").is_file()
         assert (single / "draft.md").is_file()
+
+
+def test_process_batch_parallel_keeps_order(tmp_path: Path):
+    from scripts.alarm_triage.batch import process_batch
+
+    out_dir = tmp_path / "batch"
+    summary = process_batch("demo/alarms/*.json", out_dir, offline=True, workers=2)
+    assert summary["alarms"] == sorted(summary["alarms"])
+    assert "probes_offline" not in summary["alarms"]
+    kpi = (out_dir / "kpi.csv").read_text(encoding="utf-8").splitlines()
+    assert kpi[1:] == [f"{a},ok" for a in summary["alarms"]]
+    for alarm_id in summary["alarms"]:
+        assert (out_dir / alarm_id / "validation.json").is_file()
+
+
+def test_iter_alarm_files_matches_glob():
+    import glob
+    from scripts.alarm_triage.triage import iter_alarm_files
+
+    for pattern in ("demo/alarms/*.json", "demo/alarms/A00[12].json"):
+        assert sorted(map(str, iter_alarm_files(pattern))) == sorted(glob.glob(pattern))
+
+
+def test_load_alarm_candidate_skips_auxiliary_json(tmp_path: Path):
+    from scripts.alarm_triage.triage import load_alarm_candidate
+
+    assert load_alarm_candidate(Path("demo/alarms/probes_offline.json")) is None
+    assert load_alarm_candidate(Path("demo/alarms/A001.json"))["id"] == "A001"
+    broken = tmp_path / "broken.json"
+    broken.write_text('{"id": ', encoding="utf-8")
+    assert load_alarm_candidate(broken) is None
+
+
+def test_iter_alarm_candidates_filters_and_keeps_order():
+    from scripts.alarm_triage.triage import iter_alarm_candidates, iter_alarm_files
+
+    pairs = list(iter_alarm_candidates("demo/alarms/*.json", workers=2))
+    paths = [p for p in iter_alarm_files("demo/alarms/*.json") if p.name != "probes_offline.json"]
+    assert [p for p, _ in pairs] == paths
+    assert all(alarm["id"] == p.stem for p, alarm in pairs)
+
+
+def test_process_batch_forks_after_loader_threads_exit(tmp_path: Path, monkeypatch, process_pool_calls):
+    from concurrent.futures import ThreadPoolExecutor
+    from scripts.alarm_triage import batch, triage
+
+    loaders = []
+
+    class LoaderPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            loaders.append(self)
+
+    def loader_threads_alive():
+        return [t for ex in loaders for t in ex._threads if t.is_alive()]
+
+    seen = []
+    process_pool_calls.hooks.append(lambda: seen.append((len(loaders), loader_threads_alive())))
+    monkeypatch.setattr(triage, "ThreadPoolExecutor", LoaderPool)
+    batch.process_batch("demo/alarms/*.json", tmp_path / "batch", offline=True, workers=2)
+    assert seen == [(1, [])]
+
+
+def test_process_batch_caps_pool_at_alarm_count(tmp_path: Path, process_pool_calls):
+    from scripts.alarm_triage import batch
+
+    summary = batch.process_batch("demo/alarms/*.json", tmp_path / "batch", offline=True, workers=64)
+    assert process_pool_calls.sizes == [summary["count"]]
+    empty = batch.process_batch(str(tmp_path / "none" / "*.json"), tmp_path / "empty", offline=True)
+    assert empty["count"] == 0 and len(process_pool_calls.sizes) == 1
+
+
+def test_cli_app_attribute_still_importable():
+    import typer
+    from scripts.alarm_triage.batch import app as batch_app
+    from scripts.alarm_triage.triage import app as triage_app
+
+    assert isinstance(batch_app, typer.Typer) and isinstance(triage_app, typer.Typer)
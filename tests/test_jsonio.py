@@ -0,0 +1,29 @@
+import json
+
+from scripts.alarm_triage import jsonio
+
+
+def test_dumps_matches_stdlib_layout():
+    obj = {"alarm_id": "A001", "offline": True, "rtt_ms": 12.5, "hops": ["198.51.0.1"], "empty": []}
+    assert jsonio.dumps(obj, indent=True).decode("utf-8") == json.dumps(obj, indent=2)
+
+
+def test_roundtrip_bytes_and_non_str_keys():
+    assert jsonio.loads(jsonio.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+    # orjson rejects non-str keys; the stdlib fallback must take over
+    assert jsonio.loads(jsonio.dumps({1: "x"}, indent=True)) == {"1": "x"}
+
+
+def test_write_file_truncates_existing(tmp_path):
+    target = tmp_path / "validation.json"
+    target.write_bytes(b"x" * 100)
+    jsonio.write_file(target, b"{}")
+    assert target.read_bytes() == b"{}"
+
+
+def test_dumps_escapes_like_stdlib_unless_told_not_to():
+    obj = {"site": "Montréal", "loss": float("nan"), "none": None}
+    assert jsonio.dumps(obj, indent=True).decode("utf-8") == json.dumps(obj, indent=2)
+    assert jsonio.dumps(obj) == json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    raw = jsonio.dumps({"site": "Montréal"}, ensure_ascii=False)
+    assert raw == '{"site":"Montréal"}'.encode("utf-8")
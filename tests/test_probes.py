@@ -0,0 +1,48 @@
+import socket
+
+from scripts.alarm_triage import probes
+
+
+def test_resolve_caches_until_ttl(monkeypatch):
+    calls = []
+
+    def fake_getaddrinfo(host, *args, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.10", 0))]
+
+    monkeypatch.setattr(probes.socket, "getaddrinfo", fake_getaddrinfo)
+    monkeypatch.setattr(probes, "_dns_cache", {})
+    clock = [100.0]
+    monkeypatch.setattr(probes.time, "monotonic", lambda: clock[0])
+
+    assert probes._resolve("rtr-site001-core") == "192.0.2.10"
+    assert probes._resolve("rtr-site001-core") == "192.0.2.10"
+    assert calls == ["rtr-site001-core"]
+    clock[0] += probes.DNS_TTL + 1
+    probes._resolve("rtr-site001-core")
+    assert len(calls) == 2
+
+
+def test_resolve_failure_passes_host_through(monkeypatch):
+    def boom(*args, **kwargs):
+        raise socket.gaierror("nope")
+
+    monkeypatch.setattr(probes.socket, "getaddrinfo", boom)
+    monkeypatch.setattr(probes, "_dns_cache", {})
+    assert probes._resolve("no-such-host.invalid") == "no-such-host.invalid"
+    assert probes._dns_cache == {}
+
+
+def test_offline_probes_reparsed_after_edit(tmp_path):
+    import os
+
+    probes_file = tmp_path / "probes_offline.json"
+    probes_file.write_text('{"ping": "a"}', encoding="utf-8")
+    first = probes.load_offline_probes(probes_file)
+    first["ping"] = "mutated"
+    assert probes.load_offline_probes(probes_file) == {"ping": "a"}
+    probes_file.write_text('{"ping": "b"}', encoding="utf-8")
+    st = probes_file.stat()
+    os.utime(probes_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert probes.load_offline_probes(probes_file) == {"ping": "b"}
+    assert "error" in probes.load_offline_probes(tmp_path / "missing.json")
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from scripts import push_change
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_parse_ntp_reads_configured_servers():
+    cfg = "hostname r1\nntp server 1.1.1.1\nntp server  10.0.0.1 prefer\n"
+    assert push_change.parse_ntp(cfg) == {"1.1.1.1", "10.0.0.1"}
+
+
+def test_offline_transforms_are_idempotent():
+    before = (ROOT / "demo" / "configs" / "edge-rtr01.cfg").read_text(encoding="utf-8")
+    before += "ntp server 10.0.0.1\nbanner login ^COld^C\n"
+    opts = dict(
+        desired_ntp=["1.1.1.1", "1.0.0.1"],
+        enforce=True,
+        banner="Authorized access only",
+        disable_http=True,
+        fix_ssh=True,
+        timestamps=True,
+    )
+
+    after = push_change.apply_offline_transforms(before, **opts)
+    assert push_change.unified_diff_text(before, after, "edge-rtr01")
+    assert "ntp server 10.0.0.1" not in after
+    assert " transport input ssh" in after and "telnet" not in after
+
+    again = push_change.apply_offline_transforms(after, **opts)
+    assert push_change.unified_diff_text(after, again, "edge-rtr01") == ""
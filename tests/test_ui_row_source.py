@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 import types
 
@@ -44,3 +45,34 @@ def test_row_source_excludes_meta(tmp_path, monkeypatch):
     assert ids_with_diag2 == ['A001', 'A002']  # probes_offline not present so unchanged
 
     assert 'batch' in EXCLUDE_META
+
+
+def test_resolve_alarm_paths_reparses_edited_file(tmp_path):
+    from ui.app import resolve_alarm_paths
+
+    alarm = tmp_path / 'A001.json'
+    alarm.write_text(json.dumps({'id': 'A001'}), encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('x', encoding='utf-8')
+    glob_pattern = str(tmp_path / '*.json')
+    assert [p.name for p in resolve_alarm_paths(glob_pattern)] == ['A001.json']
+
+    st = alarm.stat()
+    alarm.write_text(json.dumps({'note': 'no id'}), encoding='utf-8')
+    os.utime(alarm, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert resolve_alarm_paths(glob_pattern) == []
+
+
+def test_artifacts_zip_skips_dot_work_dirs(tmp_path):
+    import io
+    import zipfile
+    from ui.app import build_artifacts_zip
+
+    (tmp_path / 'A001').mkdir()
+    (tmp_path / 'A001' / 'validation.json').write_text('{}', encoding='utf-8')
+    work = tmp_path / '.A001.0123abcd.tmp'
+    (work / 'context').mkdir(parents=True)
+    (work / 'context' / 'prior_incidents.json').write_text('{}', encoding='utf-8')
+    (tmp_path / '.A001.0123abcd.tmp.context.old').mkdir()
+
+    with zipfile.ZipFile(io.BytesIO(build_artifacts_zip(tmp_path))) as zf:
+        assert zf.namelist() == [os.path.join('A001', 'validation.json')]
@@ -12,10 +12,11 @@ Key behaviors (as per one-shot hardening prompt):
 """
 
 import argparse
+import fnmatch
 import glob
 import io
-import json
 import os
+import stat
 import sys
 import time
 import zipfile
@@ -41,7 +42,6 @@ if Version(st.__version__) < Version(MIN):  # pragma: no cover - defensive
 # ---------------------------------------------------------------------------
 # Path normalization helpers (always relative to repo root)
 # ---------------------------------------------------------------------------
-from pathlib import Path as _PathAlias  # noqa: E402
 ROOT = Path(__file__).resolve().parents[1]
 
 def to_root(p: str | Path) -> Path:
@@ -55,19 +55,16 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 try:  # Friendly import check for triage pipeline
-    from scripts.alarm_triage.triage import triage_one, triage_batch  # type: ignore
+    from scripts.alarm_triage.triage import triage_one, triage_batch, ZIP_LEVEL  # type: ignore
+    from scripts.alarm_triage import jsonio  # orjson when installed, stdlib json otherwise
 except Exception:  # pragma: no cover - user setup issue
-    import streamlit as st  # local import safe
     st.error("Could not import triage pipeline. Ensure you installed requirements and are running from the repo root.")
     st.stop()
 
 # ----------------------------------------------------------------------------------
 # Severity ranking helper (transient sorting only)
 # ----------------------------------------------------------------------------------
-SEV_RANK = {"critical": 3, "major": 2, "minor": 1}
-
-def _sev_rank(s: str) -> int:
-    return SEV_RANK.get(str(s).lower(), 0)
+SEV_RANK = {"critical": 3, "major": 2, "minor": 1}  # anything else ranks 0
 
 # ----------------------------------------------------------------------------------
 # Logging setup (if available)
@@ -90,6 +87,10 @@ def as_int64_nullable(series: pd.Series) -> pd.Series:
     Non (int|float) or non-finite values become <NA>.
     Values are rounded (banker's rounding per pandas .round) before cast.
     """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        # already numeric (the row builder emits float/None): vectorized path
+        s = pd.to_numeric(series, errors="coerce").astype("float64")
+        return s.where(np.isfinite(s)).round().astype("Int64")
     def _keep_num(v):
         return v if isinstance(v, (int, float, np.integer, np.floating)) and np.isfinite(v) else None
     s = series.map(_keep_num)
@@ -97,7 +98,7 @@ def as_int64_nullable(series: pd.Series) -> pd.Series:
     return s.round().astype("Int64")
 
 # Meta directories to always ignore (single source of truth is alarms glob)
-EXCLUDE_META = {"batch", "ui", ".cache", ".DS_Store"}
+EXCLUDE_META = frozenset({"batch", "ui", ".cache", ".DS_Store"})
 
 def _normalize_glob(g: str) -> str:
     """Return absolute glob string rooted at REPO_ROOT if relative."""
@@ -107,18 +108,56 @@ def _normalize_glob(g: str) -> str:
     return str(p)
 
 
+@st.cache_resource(show_spinner=False, max_entries=4096)
+def _parse_json_file(path: str, mtime_ns: int) -> Any:
+    """Parsed JSON for ``path`` (None on error); keyed on mtime so edits re-parse.
+
+    Cached across reruns and shared by every caller: treat the result as read-only.
+    """
+    try:
+        return jsonio.loads(Path(path).read_bytes())
+    except Exception:
+        return None
+
+
+def _read_json(path: str | Path, mtime_ns: Optional[int] = None) -> Any:
+    """Cached parse of a JSON file; pass ``mtime_ns`` when a DirEntry already has it."""
+    path = str(path)
+    if mtime_ns is None:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    return _parse_json_file(path, mtime_ns)
+
+
+def _scan_alarm_glob(abs_glob: str) -> List[tuple[str, Any]]:
+    """(path, parsed JSON) for regular files matching the glob, sorted by path.
+
+    One scandir of the parent directory instead of glob + per-file stats; falls
+    back to glob.glob when the directory part itself contains wildcards.
+    """
+    parent, name = os.path.split(abs_glob)
+    if glob.has_magic(parent):
+        return [(p, _read_json(p)) for p in sorted(glob.glob(abs_glob)) if os.path.isfile(p)]
+    hidden_ok = name.startswith(".")  # glob skips dotfiles unless asked for them
+    found: List[tuple[str, Any]] = []
+    try:
+        with os.scandir(parent or ".") as it:
+            for e in it:
+                if (hidden_ok or not e.name.startswith(".")) and fnmatch.fnmatch(e.name, name) and e.is_file():
+                    found.append((e.path, _read_json(e.path, e.stat().st_mtime_ns)))
+    except OSError:
+        return []
+    found.sort(key=lambda t: t[0])
+    return found
+
+
 def resolve_alarm_paths(glob_pattern: str) -> List[Path]:
     """Return sorted list of alarm JSON paths from glob (relative paths resolved to repo root)."""
-    glob_pattern = _normalize_glob(glob_pattern)
-    parent = Path(glob_pattern).parent
-    name = Path(glob_pattern).name
-    paths = sorted(parent.glob(name))
     good: List[Path] = []
-    for p in paths:
-        try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            continue
+    for path, data in _scan_alarm_glob(_normalize_glob(glob_pattern)):
+        p = Path(path)
         if isinstance(data, dict) and data.get("id") and p.stem not in EXCLUDE_META:
             good.append(p)
     return good
@@ -155,7 +194,8 @@ OUT_ROOT.mkdir(parents=True, exist_ok=True)
 # ----------------------------------------------------------------------------------
 # Helpers
 # ----------------------------------------------------------------------------------
-SENSITIVE_KEYS = {"password", "secret", "community", "token"}
+SENSITIVE_KEYS = frozenset({"password", "secret", "community", "token"})  # lowercase
+REDACTED = "***REDACTED***"
 
 
 def sanitize_output_dir(out_root: Path) -> Path:  # retained for back-compat use elsewhere
@@ -167,36 +207,45 @@ def sanitize_output_dir(out_root: Path) -> Path:  # retained for back-compat use
 
 
 def load_alarm(path: Path) -> Dict[str, Any]:
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    data = _read_json(path)
+    return {} if data is None else data
+
+
+def _is_sensitive(k: str) -> bool:
+    # islower() allocates nothing; only mixed/upper-case keys pay for .lower()
+    return k in SENSITIVE_KEYS or (not k.islower() and k.lower() in SENSITIVE_KEYS)
 
 
 def redact(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        return {k: ("***REDACTED***" if k.lower() in SENSITIVE_KEYS else redact(v)) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [redact(v) for v in obj]
-    return obj
+    """Copy of ``obj`` with sensitive dict values masked (explicit stack, no recursion)."""
+    if not isinstance(obj, (dict, list)):
+        return obj
+    root: Any = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        items = src.items() if isinstance(src, dict) else enumerate(src)
+        for k, v in items:
+            if isinstance(dst, dict) and _is_sensitive(k):
+                v = REDACTED
+            elif isinstance(v, (dict, list)):
+                child: Any = {} if isinstance(v, dict) else []
+                stack.append((v, child))
+                v = child
+            if isinstance(dst, dict):
+                dst[k] = v
+            else:
+                dst.append(v)
+    return root
 
 
 def iter_alarm_files(pattern: str) -> List[Path]:
     """Return alarm JSON Paths strictly from glob (no meta injection)."""
-    abs_glob = str(to_root(pattern))
-    paths = sorted(glob.glob(abs_glob))
-    good: List[Path] = []
-    for p in paths:
-        P = Path(p)
-        if not P.is_file():
-            continue
-        try:
-            data = json.loads(P.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        if isinstance(data, dict) and data.get("id"):
-            good.append(P)
-    return good
+    return [
+        Path(p)
+        for p, data in _scan_alarm_glob(str(to_root(pattern)))
+        if isinstance(data, dict) and data.get("id")
+    ]
 
 
 def run_single_alarm(alarm_file: Path, out_root: Path, run_id: Optional[str] = None) -> Dict[str, Any]:
@@ -211,11 +260,8 @@ def run_single_alarm(alarm_file: Path, out_root: Path, run_id: Optional[str] = N
 
 
 def aggregate_validation(single_dir: Path) -> Dict[str, Any]:
-    val_file = single_dir / "validation.json"
-    if not val_file.is_file():
-        return {}
-    try:
-        return json.loads(val_file.read_text(encoding="utf-8"))
+    try:  # missing file raises too; no separate is_file() stat
+        return jsonio.loads((single_dir / "validation.json").read_bytes())
     except Exception:
         return {}
 
@@ -224,42 +270,78 @@ def compute_kpis(out_root: Path) -> Dict[str, Any]:
     total = 0
     pass_ct = 0
     fail_ct = 0
-    for single in out_root.iterdir():
-        if not single.is_dir():
-            continue
-        val = aggregate_validation(single)
-        if not val:
-            continue
-        total += 1
-        status = val.get("status") or val.get("result")
-        if status and status.lower() in ("ok", "pass", "success"):
-            pass_ct += 1
-        else:
-            fail_ct += 1
+    # One scandir pass: DirEntry.is_dir() usually needs no extra stat, and
+    # validation.json is simply opened (a missing file is the common miss).
+    with os.scandir(out_root) as it:
+        for e in it:
+            # dot dirs are triage's in-flight ".<alarm>.<uuid>.tmp" work dirs
+            if e.name in EXCLUDE_META or e.name.startswith(".") or not e.is_dir():
+                continue
+            try:
+                with open(os.path.join(e.path, "validation.json"), "rb") as fh:
+                    val = jsonio.loads(fh.read())
+            except Exception:
+                continue
+            if not isinstance(val, dict) or not val:
+                continue
+            total += 1
+            status = val.get("status") or val.get("result")
+            if status and status.lower() in ("ok", "pass", "success"):
+                pass_ct += 1
+            else:
+                fail_ct += 1
     ratio_pass = f"{pass_ct}/{total}" if total else "0/0"
     ratio_fail = f"{fail_ct}/{total}" if total else "0/0"
     return {"total": total, "pass": pass_ct, "fail": fail_ct, "ratio_pass": ratio_pass, "ratio_fail": ratio_fail}
 
 
+# Already-compressed members are stored as-is; deflating them again only burns CPU
+_ZIP_STORE_SUFFIXES = frozenset({".zip", ".gz", ".png", ".jpg", ".jpeg"})
+
+
+def _iter_files(root: str, rel_dir: str = ""):
+    """Yield (full path, root-relative path) for regular files under ``root`` via os.scandir.
+
+    Dot entries are skipped: in-flight ``.<alarm>.<uuid>.tmp`` work dirs and ``.old`` leftovers.
+    """
+    with os.scandir(os.path.join(root, rel_dir)) as it:
+        for e in it:
+            if e.name.startswith("."):
+                continue
+            rel = os.path.join(rel_dir, e.name)
+            if e.is_dir(follow_symlinks=False):
+                yield from _iter_files(root, rel)
+            elif e.is_file():
+                yield e.path, rel
+
+
 def build_artifacts_zip(out_root: Path) -> bytes:
     mem = io.BytesIO()
-    with zipfile.ZipFile(mem, "w", zipfile.ZIP_DEFLATED) as zf:
-        for p in out_root.rglob("*"):
-            if p.is_file():
-                zf.write(p, p.relative_to(out_root))
-    mem.seek(0)
-    return mem.read()
+    with zipfile.ZipFile(mem, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_LEVEL) as zf:
+        for full, rel in _iter_files(str(out_root)):
+            store = os.path.splitext(rel)[1].lower() in _ZIP_STORE_SUFFIXES
+            zf.write(full, rel, compress_type=zipfile.ZIP_STORED if store else None)
+    return mem.getvalue()
 
 
-def _build_row(aid: str, alarm_path: Path, out_root: Path) -> Dict[str, Any]:
-    """Create one human row combining alarm + validation artifacts. Columns order per spec."""
-    try:
-        alarm = json.loads(alarm_path.read_text(encoding="utf-8"))
-    except Exception:
+# Table columns, in display order; _pass is a transient sort key
+ROW_COLUMNS = (
+    "Status", "Severity", "Site", "Service", "Alarm", "Node", "Symptom",
+    "Ping loss", "RTT (ms)", "Traceroute last hop", "Artifacts", "_pass",
+)
+
+
+def _build_row(aid: str, alarm_path: Path, out_root: Path, alarm: Any = None) -> tuple:
+    """Create one human row combining alarm + validation artifacts, as values in ROW_COLUMNS order.
+
+    ``alarm`` is the already-parsed alarm JSON when the caller has it.
+    """
+    if alarm is None:
+        alarm = load_alarm(alarm_path)
+    if not isinstance(alarm, dict):
         alarm = {}
-    vpath = out_root / aid / "validation.json"
-    try:
-        v = json.loads(vpath.read_text(encoding="utf-8")) if vpath.exists() else {}
+    try:  # a missing file just raises; no exists() stat first
+        v = jsonio.loads((out_root / aid / "validation.json").read_bytes())
     except Exception:
         v = {}
     ping_loss = v.get("ping_loss")
@@ -272,35 +354,31 @@ def _build_row(aid: str, alarm_path: Path, out_root: Path) -> Dict[str, Any]:
     else:
         ping_human = "—"
     last_hop = v.get("traceroute_last_hop") or "—"
-    severity = (alarm.get("severity") or "info").lower()
-    sev = severity
+    sev = (alarm.get("severity") or "info").lower()
     node = alarm.get("source") or alarm.get("device") or "—"
     rtt = v.get("rtt_ms")
     if not isinstance(rtt, (int, float)):
         rtt = None
-    # Build row (numeric fields use None for missing to remain Arrow friendly)
-    row = {
-        "Status": "✅ PASS" if status_flag else "❌ FAIL",
-        "Severity": sev,
-        "Site": alarm.get("site", "—"),
-        "Service": alarm.get("service", "—"),
-        "Alarm": aid,
-        "Node": node,
-        "Symptom": alarm.get("message") or alarm.get("description") or "—",
-        "Ping loss": ping_human,
-        "RTT (ms)": float(rtt) if rtt is not None else None,
-        "Traceroute last hop": last_hop,
-        "Artifacts": str((out_root / aid).resolve()),
-        "_pass": status_flag,
-    "_sev_rank": _sev_rank(severity),
-    }
-    return row
+    # numeric fields use None for missing to remain Arrow friendly
+    return (
+        "✅ PASS" if status_flag else "❌ FAIL",
+        sev,
+        alarm.get("site", "—"),
+        alarm.get("service", "—"),
+        aid,
+        node,
+        alarm.get("message") or alarm.get("description") or "—",
+        ping_human,
+        float(rtt) if rtt is not None else None,
+        last_hop,
+        str((out_root / aid).resolve()),
+        status_flag,
+    )
 
 
 @st.cache_data(show_spinner=False)
 def get_cli_version() -> str:
     try:
-        import importlib.metadata as im
         # Not packaged; fallback to git describe or revision time
         return os.getenv("GIT_COMMIT", "dev")
     except Exception:
@@ -332,19 +410,70 @@ if not ALARM_FILES:
 ss = st.session_state
 if "selected_alarm" not in ss and ALARM_FILES:
     ss.selected_alarm = str(ALARM_FILES[0])
-ss.setdefault("rows", [])
+ss.setdefault("rows", pd.DataFrame())
 ss.setdefault("last_run_ts", None)
 
-def collect_rows(alarm_paths: List[Path], include_diag: bool) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    for p in alarm_paths:
-        aid = p.stem
-        rows.append(_build_row(aid, p, OUT_ROOT))
+def collect_rows(alarm_paths: List[Path] | List[tuple[str, Any]], include_diag: bool) -> pd.DataFrame:
+    """Table for the given alarm files, or for (path, parsed alarm) pairs from a scan.
+
+    Built column-wise: one list per column, a single DataFrame constructor.
+    """
+    rows: List[tuple] = []
+    for item in alarm_paths:
+        path, alarm = item if isinstance(item, tuple) else (item, None)
+        p = Path(path)
+        rows.append(_build_row(p.stem, p, OUT_ROOT, alarm))
     if include_diag:
         diag = ROOT / "demo" / "alarms" / "probes_offline.json"
         if diag.exists():
             rows.append(_build_row("probes_offline", diag, OUT_ROOT))
-    return rows
+    cols = dict(zip(ROW_COLUMNS, map(list, zip(*rows)))) if rows else {c: [] for c in ROW_COLUMNS}
+    df = pd.DataFrame(cols, columns=list(ROW_COLUMNS))
+    df["_sev_rank"] = df["Severity"].map(SEV_RANK).fillna(0).astype("int8")
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _display_frame(rows: pd.DataFrame) -> pd.DataFrame:
+    """Display-ready, sorted copy of the rows table.
+
+    Cached on the table's contents: the rows only change when triage runs, so
+    plain reruns (toggles, "View draft") skip the path resolution and casts.
+    """
+    df = rows.copy()
+    # Normalize Alarm (ID only) and Artifacts (repo-relative path)
+    def _alarm_label(val: str) -> str:
+        p = Path(str(val))
+        return p.stem if p.suffix == ".json" else p.name
+    def _short_path(p: str) -> str:
+        try:
+            return str(Path(p).resolve().relative_to(ROOT))
+        except Exception:
+            return str(p)
+    if "Alarm" in df.columns:
+        df["Alarm"] = df["Alarm"].apply(_alarm_label)
+    if "Artifacts" in df.columns:
+        df["Artifacts"] = df["Artifacts"].apply(_short_path)
+    if "Alarm" not in df.columns and "Artifacts" in df.columns:
+        df["Alarm"] = df["Artifacts"].apply(lambda p: Path(str(p)).name)
+    # Type coercions (Arrow safe)
+    if "RTT (ms)" in df.columns:
+        # Robust coercion (sanitizes non-numeric to <NA>)
+        df["RTT (ms)"] = as_int64_nullable(df["RTT (ms)"])
+    for c in ["Severity", "Site", "Service", "Node", "Status"]:
+        if c in df.columns:
+            df[c] = df[c].astype("string")
+    # Sort (fail first, severity rank desc)
+    if not df.empty:
+        df = df.sort_values(by=["_pass", "_sev_rank", "Site", "Node"], ascending=[True, False, True, True], kind="mergesort")
+    # Drop transient cols for display
+    return df.drop(columns=[c for c in ["_pass", "_sev_rank"] if c in df.columns])
+
+
+@st.fragment
+def _diag_toggle() -> None:
+    # Only read when a triage button builds rows, so flipping it reruns just this widget
+    ss["show_diag"] = st.toggle("Show diagnostics (probes)", value=bool(ss.get("show_diag", False)))
+
 
 with st.sidebar:
     st.subheader("Controls")
@@ -371,8 +500,8 @@ with st.sidebar:
     else:
         st.selectbox("Alarm", options=["(none)"] , index=0, disabled=True)
 
-    show_diag = st.toggle("Show diagnostics (probes)", value=bool(ss.get("show_diag", False)))
-    ss["show_diag"] = show_diag
+    _diag_toggle()
+    show_diag = bool(ss.get("show_diag"))
 
     # Batch triage
     if st.button("Run triage (all demo alarms)", type="primary", disabled=not ALARM_FILES):
@@ -380,8 +509,7 @@ with st.sidebar:
         t0 = time.perf_counter()
         with st.spinner("Running triage (all alarms)..."):
             triage_batch(ALARMS_GLOB, OUT_ROOT, offline=True, emit_draft=True, run_id=run_id)
-        alarm_paths = [Path(p) for p in sorted(glob.glob(ALARMS_GLOB)) if Path(p).is_file()]
-        ss["rows"] = collect_rows(alarm_paths, include_diag=show_diag)
+        ss["rows"] = collect_rows(_scan_alarm_glob(ALARMS_GLOB), include_diag=show_diag)
         ss["last_run_ts"] = time.time()
         st.toast("Triage complete", icon="✅")
 
@@ -399,7 +527,7 @@ with st.sidebar:
     if st.button("Clear artifacts"):
         import shutil as _shutil
         _shutil.rmtree(OUT_ROOT, ignore_errors=True)
-        ss["rows"] = []
+        ss["rows"] = pd.DataFrame()
         ss["last_run_ts"] = time.time()
         st.toast("Cleared", icon="🧹")
 
@@ -415,12 +543,18 @@ show_diag = bool(ss.get("show_diag"))
 
 def _any_artifacts_exist(out_root: Path) -> bool:
     try:
-        return any((d.is_dir() and (d / "validation.json").exists()) for d in out_root.iterdir() if d.is_dir())
+        with os.scandir(out_root) as it:
+            return any(
+                not e.name.startswith(".")  # skip triage's in-flight work dirs
+                and e.is_dir()
+                and os.path.exists(os.path.join(e.path, "validation.json"))
+                for e in it
+            )
     except FileNotFoundError:
         return False
 
-rows: List[Dict[str, Any]] = ss.get("rows", [])
-data_ready = len(rows) > 0 and OUT_ROOT.exists() and _any_artifacts_exist(OUT_ROOT)
+rows: pd.DataFrame = ss.get("rows", pd.DataFrame())
+data_ready = len(rows) > 0 and _any_artifacts_exist(OUT_ROOT)
 
 # Gate rendering KPI/table only when data ready (but keep page interactive)
 def _show_draft_modal(aid: str):
@@ -428,19 +562,9 @@ def _show_draft_modal(aid: str):
     out_dir = OUT_ROOT / aid
     draft_path = out_dir / "draft.md"
     pack_zip = out_dir / f"{aid}_pack.zip"
-    validation_path = out_dir / "validation.json"
-    alarm_file = None
-    # Attempt to locate original alarm json
+    # Attempt to locate original alarm json (load_alarm returns {} when absent)
     base_dir = Path(ARGS.alarms.split("*")[0]) if "*" in ARGS.alarms else Path(ARGS.alarms).parent
-    cand = base_dir / f"{aid}.json"
-    if cand.is_file():
-        alarm_file = cand
-    alarm = {}
-    if alarm_file:
-        try:
-            alarm = json.loads(alarm_file.read_text(encoding="utf-8"))
-        except Exception:
-            alarm = {}
+    alarm = load_alarm(base_dir / f"{aid}.json")
     node = alarm.get("source") or alarm.get("device") or "—"
     severity = alarm.get("severity", "—")
     title = f"Alarm {aid} draft"
@@ -450,142 +574,117 @@ def _show_draft_modal(aid: str):
         ctx = st.expander(title, expanded=True)
     with ctx:
         st.markdown(f"**Alarm {aid} — {node} — {severity}**")
-        # timestamp
+        # timestamp (one stat answers both "is there a draft" and "when")
         ts = None
-        if draft_path.is_file():
-            try:
-                ts = datetime.fromtimestamp(draft_path.stat().st_mtime, tz=timezone.utc)
-            except Exception:
-                pass
+        try:
+            draft_st = draft_path.stat()
+        except OSError:
+            draft_st = None
+        has_draft = draft_st is not None and stat.S_ISREG(draft_st.st_mode)
+        if has_draft:
+            ts = datetime.fromtimestamp(draft_st.st_mtime, tz=timezone.utc)
         duration_s = "—"
-        dur_file = out_dir / "duration_s.txt"
-        if dur_file.is_file():
-            try:
-                duration_s = dur_file.read_text().strip()
-            except Exception:
-                pass
+        try:
+            duration_s = (out_dir / "duration_s.txt").read_text().strip()
+        except Exception:
+            pass
         if ts:
             st.markdown(f"Generated: {ts:%Y-%m-%d %H:%M:%S %Z} • Duration: {duration_s}s")
         else:
             st.markdown(f"Generated: — • Duration: {duration_s}s")
         # draft preview
-        if draft_path.is_file():
-            st.code(draft_path.read_text(encoding="utf-8"), language="markdown")
-            st.download_button("Download draft.md", data=draft_path.read_text(encoding="utf-8"), file_name=f"{aid}_draft.md")
+        if has_draft:
+            draft_text = draft_path.read_text(encoding="utf-8")
+            st.code(draft_text, language="markdown")
+            st.download_button("Download draft.md", data=draft_text, file_name=f"{aid}_draft.md")
         else:
             st.info("No draft.md present.")
-        if pack_zip.is_file():
-            st.download_button("Download pack.zip", data=pack_zip.read_bytes(), file_name=pack_zip.name)
+        try:
+            pack_bytes = pack_zip.read_bytes()
+        except OSError:
+            pack_bytes = None
+        if pack_bytes is not None:
+            st.download_button("Download pack.zip", data=pack_bytes, file_name=pack_zip.name)
         else:
             st.button("Download pack.zip", disabled=True)
 
-alarm_ids_for_duration = {r["Alarm"] for r in rows} if data_ready else set()
-total_secs = 0.0
-for dur_file in OUT_ROOT.glob("*/duration_s.txt"):
-    if dur_file.parent.name in alarm_ids_for_duration:
-        try:
-            total_secs += float(dur_file.read_text().strip())
-        except Exception:
-            pass
-
-if data_ready:
-    n = len(rows)
-    p_ct = sum(r.get("_pass", False) for r in rows)
-    f_ct = n - p_ct
-    k1, k2 = st.columns(2)
-    k1.metric("PASS", f"{p_ct}/{n}", f"{int(100 * p_ct / max(n,1))}%")
-    k2.metric("FAIL", f"{f_ct}/{n}", f"{int(100 * f_ct / max(n,1))}%")
-    import pandas as pd  # type: ignore
-    df = pd.DataFrame(rows)
-    # Normalize Alarm (ID only) and Artifacts (repo-relative path)
-    from pathlib import Path as _PathNorm
-    def _alarm_label(val: str) -> str:
-        p = _PathNorm(str(val))
-        return p.stem if p.suffix == ".json" else p.name
-    def _short_path(p: str) -> str:
+# The table, KPIs and per-row drafts rerun on their own: "View draft" clicks
+# don't re-scan alarms or rebuild the sidebar.
+@st.fragment
+def _render_table() -> None:
+    if data_ready:
+        n = len(rows)
+        p_ct = int(rows["_pass"].sum())
+        f_ct = n - p_ct
+        k1, k2 = st.columns(2)
+        k1.metric("PASS", f"{p_ct}/{n}", f"{int(100 * p_ct / max(n,1))}%")
+        k2.metric("FAIL", f"{f_ct}/{n}", f"{int(100 * f_ct / max(n,1))}%")
+        display_df = _display_frame(rows)
+        # Column config for prettier numeric display
         try:
-            return str(_PathNorm(p).resolve().relative_to(ROOT))
-        except Exception:
-            return str(p)
-    if "Alarm" in df.columns:
-        df["Alarm"] = df["Alarm"].apply(_alarm_label)
-    if "Artifacts" in df.columns:
-        df["Artifacts"] = df["Artifacts"].apply(_short_path)
-    if "Alarm" not in df.columns and "Artifacts" in df.columns:
-        df["Alarm"] = df["Artifacts"].apply(lambda p: _PathNorm(str(p)).name)
-    # Type coercions (Arrow safe)
-    if "RTT (ms)" in df.columns:
-        # Robust coercion (sanitizes non-numeric to <NA>)
-        df["RTT (ms)"] = as_int64_nullable(df["RTT (ms)"])
-    for c in ["Severity", "Site", "Service", "Node", "Status"]:
-        if c in df.columns:
-            df[c] = df[c].astype("string")
-    # Sort (fail first, severity rank desc)
-    if not df.empty:
-        df = df.sort_values(by=["_pass", "_sev_rank", "Site", "Node"], ascending=[True, False, True, True], kind="mergesort")
-    # Drop transient cols for display
-    display_df = df.drop(columns=[c for c in ["_pass", "_sev_rank"] if c in df.columns])
-    # Column config for prettier numeric display
-    try:
-        from streamlit import column_config as colcfg  # lazy import for backward compat
-        table_cfg = {"RTT (ms)": colcfg.NumberColumn("RTT (ms)", format="%d")}
-        st.dataframe(display_df, width="stretch", column_config=table_cfg, hide_index=True)
-    except Exception:  # fallback if older Streamlit
-        st.dataframe(display_df, width="stretch")
-
-    # Per-row draft buttons (hashed keys + modal fallback)
-    def _row_key(row) -> str:
-        base = f"{row.get('Alarm')}|{row.get('Artifacts')}|{row.get('Node')}"
-        return hashlib.sha1(base.encode()).hexdigest()[:10]
-
-    def _render_draft(row: dict, k: str):
-        from pathlib import Path as _P
-        aid = str(row.get("Alarm"))
-        pack_dir = _P(str(row.get("Artifacts", "")))
-        if not pack_dir.is_absolute():  # resolve relative to ROOT
-            pack_dir = ROOT / pack_dir
-        # Prefer draft.md, fallback to snow_draft.md
-        md_file = pack_dir / "draft.md"
-        if not md_file.exists():
-            alt = pack_dir / "snow_draft.md"
-            if alt.exists():
-                md_file = alt
-        if md_file.exists():
-            try:
-                st.markdown(md_file.read_text(encoding="utf-8"))
-            except Exception:
+            from streamlit import column_config as colcfg  # lazy import for backward compat
+            table_cfg = {"RTT (ms)": colcfg.NumberColumn("RTT (ms)", format="%d")}
+            st.dataframe(display_df, width="stretch", column_config=table_cfg, hide_index=True)
+        except Exception:  # fallback if older Streamlit
+            st.dataframe(display_df, width="stretch")
+
+        # Per-row draft buttons (hashed keys + modal fallback)
+        def _row_key(row) -> str:
+            base = f"{row.get('Alarm')}|{row.get('Artifacts')}|{row.get('Node')}"
+            return hashlib.sha1(base.encode()).hexdigest()[:10]
+
+        def _render_draft(row: dict, k: str):
+            aid = str(row.get("Alarm"))
+            pack_dir = Path(str(row.get("Artifacts", "")))
+            if not pack_dir.is_absolute():  # resolve relative to ROOT
+                pack_dir = ROOT / pack_dir
+            # Prefer draft.md, fallback to snow_draft.md; open instead of exists() probes
+            md_text: Optional[str] = None
+            unreadable = False
+            for md_name in ("draft.md", "snow_draft.md"):
+                try:
+                    md_text = (pack_dir / md_name).read_text(encoding="utf-8")
+                    break
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    unreadable = True
+                    break
+            if md_text is not None:
+                st.markdown(md_text)
+            elif unreadable:
                 st.info("Draft could not be read.")
-        else:
-            st.info("No draft available.")
-        # Pack zip
-        zip_file = None
-        for cand in pack_dir.glob("*_pack.zip"):
-            zip_file = cand
-            break
-        if zip_file and zip_file.exists():
-            st.download_button(
-                "Download artifacts.zip",
-                data=zip_file.read_bytes(),
-                file_name=zip_file.name,
-                key=f"dl_{k}",
-            )
-
-    for _, row in display_df.reset_index(drop=True).iterrows():
-        k = _row_key(row)
-        aid = str(row.get("Alarm", "unknown"))
-        if st.button("View draft", key=f"view_{k}"):
-            title = f"Draft: {aid}"
-            if HAS_MODAL:
-                with st.modal(title, key=f"modal_{k}"):
-                    _render_draft(row, k)
             else:
-                with st.expander(title, expanded=True):
-                    _render_draft(row, k)
-else:
-    # Provide contextual warning when no data is yet present.
-    if not ALARM_FILES:
-        st.warning("No alarms matched the glob. Tip: if you launched from `ui/`, use `../demo/alarms/*.json` or pass absolute paths.")
+                st.info("No draft available.")
+            # Pack zip (the glob already saw it on disk)
+            zip_file = next(pack_dir.glob("*_pack.zip"), None)
+            if zip_file:
+                st.download_button(
+                    "Download artifacts.zip",
+                    data=zip_file.read_bytes(),
+                    file_name=zip_file.name,
+                    key=f"dl_{k}",
+                )
+
+        for _, row in display_df.reset_index(drop=True).iterrows():
+            k = _row_key(row)
+            aid = str(row.get("Alarm", "unknown"))
+            if st.button("View draft", key=f"view_{k}"):
+                title = f"Draft: {aid}"
+                if HAS_MODAL:
+                    with st.modal(title, key=f"modal_{k}"):
+                        _render_draft(row, k)
+                else:
+                    with st.expander(title, expanded=True):
+                        _render_draft(row, k)
     else:
-        st.warning("No triage artifacts yet. Use the sidebar buttons to run triage.")
+        # Provide contextual warning when no data is yet present.
+        if not ALARM_FILES:
+            st.warning("No alarms matched the glob. Tip: if you launched from `ui/`, use `../demo/alarms/*.json` or pass absolute paths.")
+        else:
+            st.warning("No triage artifacts yet. Use the sidebar buttons to run triage.")
+
+
+_render_table()
 
 st.caption("Security: obvious secrets redacted; paths constrained under repo root. Logs structured JSON.")